@@ -3,40 +3,24 @@ CLI Handler for AI Assistant
 """
 
 import argparse
+import functools
+import glob
+import os
+import stat
 import sys
-import asyncio
-import json
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Union, TYPE_CHECKING
 import logging
 
-from core.config import ConfigManager
 from core.exceptions import AIAssistantError, ConfigurationError
-from ui.formatter import ColorFormatter
-from ui.progress_display import ProgressDisplay
-from utils.file_utils import FileValidator
 
-class CLIHandler:
-    """Command-line interface handler"""
-    
-    def __init__(self, assistant=None, config_manager: ConfigManager = None, logger=None):
-        self.assistant = assistant
-        self.config_manager = config_manager
-        self.logger = logger or logging.getLogger(__name__)
-        self.formatter = ColorFormatter()
-        self.progress = ProgressDisplay()
-        self.file_validator = FileValidator()
-        self.parser = None
-        self._setup_parser()
-    
-    def _setup_parser(self):
-        """Setup argument parser with all commands and options"""
-        try:
-            self.parser = argparse.ArgumentParser(
-                prog='ai-assistant',
-                description='🤖 AI Assistant CLI - Intelligent task automation and code generation',
-                formatter_class=argparse.RawDescriptionHelpFormatter,
-                epilog="""
+if TYPE_CHECKING:
+    from core.config import ConfigManager
+
+VERSION = 'AI Assistant CLI v1.0.0'
+
+_EPILOG = """
 Examples:
   # Interactive mode
   ai-assistant
@@ -52,348 +36,9 @@ Examples:
   
   # List available models
   ai-assistant --list-models
-                """
-            )
-            
-            # Input options
-            input_group = self.parser.add_argument_group('Input Options')
-            input_group.add_argument(
-                '-f', '--files', '--input-files',
-                nargs='+',
-                dest='input_files',
-                help='Input files (zip, text, code files)',
-                metavar='FILE'
-            )
-            input_group.add_argument(
-                '-p', '--prompt',
-                type=str,
-                help='Task prompt or instruction',
-                metavar='TEXT'
-            )
-            input_group.add_argument(
-                '--stdin',
-                action='store_true',
-                help='Read prompt from stdin'
-            )
-            
-            # Model options
-            model_group = self.parser.add_argument_group('Model Options')
-            model_group.add_argument(
-                '-m', '--model',
-                type=str,
-                default='auto',
-                help='Model to use (auto, devstral_small, llama_3_3_8b, phi_4_reasoning, deepseek_v3, qwen3_30b)',
-                metavar='MODEL'
-            )
-            model_group.add_argument(
-                '--temperature',
-                type=float,
-                help='Model temperature (0.0-2.0)',
-                metavar='FLOAT'
-            )
-            model_group.add_argument(
-                '--max-tokens',
-                type=int,
-                help='Maximum tokens to generate',
-                metavar='INT'
-            )
-            
-            # Output options
-            output_group = self.parser.add_argument_group('Output Options')
-            output_group.add_argument(
-                '-o', '--output',
-                type=str,
-                default='./output',
-                help='Output directory',
-                metavar='DIR'
-            )
-            output_group.add_argument(
-                '--format',
-                choices=['text', 'json', 'markdown'],
-                default='text',
-                help='Output format'
-            )
-            output_group.add_argument(
-                '--save-session',
-                action='store_true',
-                help='Save session for later resume'
-            )
-            
-            # Task options
-            task_group = self.parser.add_argument_group('Task Options')
-            task_group.add_argument(
-                '--task-type',
-                choices=['coding', 'analysis', 'review', 'generation', 'research', 'auto'],
-                default='auto',
-                help='Task type for optimal model selection'
-            )
-            task_group.add_argument(
-                '--parallel',
-                action='store_true',
-                help='Enable parallel task execution'
-            )
-            task_group.add_argument(
-                '--memory',
-                action='store_true',
-                help='Enable memory and context retention'
-            )
-            task_group.add_argument(
-                '--search',
-                action='store_true',
-                help='Enable semantic search in input files'
-            )
-            
-            # Sandbox options
-            sandbox_group = self.parser.add_argument_group('Sandbox Options')
-            sandbox_group.add_argument(
-                '--sandbox',
-                action='store_true',
-                default=True,
-                help='Enable sandbox execution (default: True)'
-            )
-            sandbox_group.add_argument(
-                '--no-sandbox',
-                action='store_false',
-                dest='sandbox',
-                help='Disable sandbox execution (dangerous)'
-            )
-            sandbox_group.add_argument(
-                '--timeout',
-                type=int,
-                help='Task timeout in seconds',
-                metavar='SECONDS'
-            )
-            
-            # Code quality options
-            quality_group = self.parser.add_argument_group('Code Quality Options')
-            quality_group.add_argument(
-                '--lint',
-                action='store_true',
-                help='Enable code linting'
-            )
-            quality_group.add_argument(
-                '--format-code',
-                action='store_true',
-                help='Auto-format generated code'
-            )
-            quality_group.add_argument(
-                '--test',
-                action='store_true',
-                help='Generate and run tests'
-            )
-            
-            # Browser options
-            browser_group = self.parser.add_argument_group('Browser Options')
-            browser_group.add_argument(
-                '--browser',
-                action='store_true',
-                help='Enable browser automation for research'
-            )
-            browser_group.add_argument(
-                '--headless',
-                action='store_true',
-                default=True,
-                help='Run browser in headless mode'
-            )
-            
-            # Interactive mode
-            interactive_group = self.parser.add_argument_group('Interactive Mode')
-            interactive_group.add_argument(
-                '-i', '--interactive',
-                action='store_true',
-                help='Start in interactive mode'
-            )
-            interactive_group.add_argument(
-                '--no-color',
-                action='store_true',
-                help='Disable colored output'
-            )
-            interactive_group.add_argument(
-                '--quiet',
-                action='store_true',
-                help='Quiet mode - minimal output'
-            )
-            
-            # Configuration and info
-            config_group = self.parser.add_argument_group('Configuration')
-            config_group.add_argument(
-                '--config-check',
-                action='store_true',
-                help='Check configuration and model connectivity'
-            )
-            config_group.add_argument(
-                '--list-models',
-                action='store_true',
-                help='List available models and their capabilities'
-            )
-            config_group.add_argument(
-                '--config-file',
-                type=str,
-                help='Custom configuration file path',
-                metavar='FILE'
-            )
-            config_group.add_argument(
-                '--reset-config',
-                action='store_true',
-                help='Reset configuration to defaults'
-            )
-            
-            # Debugging and logging
-            debug_group = self.parser.add_argument_group('Debugging')
-            debug_group.add_argument(
-                '--debug',
-                action='store_true',
-                help='Enable debug logging'
-            )
-            debug_group.add_argument(
-                '--log-file',
-                type=str,
-                help='Custom log file path',
-                metavar='FILE'
-            )
-            debug_group.add_argument(
-                '--dry-run',
-                action='store_true',
-                help='Show what would be done without executing'
-            )
-            
-            # Version and help
-            self.parser.add_argument(
-                '--version',
-                action='version',
-                version='AI Assistant CLI v1.0.0'
-            )
-            
-        except Exception as e:
-            self.logger.error(f"Failed to setup argument parser: {e}")
-            raise AIAssistantError(f"CLI setup failed: {e}")
-    
-    def parse_arguments(self, args: Optional[List[str]] = None) -> Dict[str, Any]:
-        """Parse command line arguments"""
-        try:
-            if args is None:
-                args = sys.argv[1:]
-            
-            # Handle special cases
-            if not args:
-                return {'interactive': True}
-            
-            parsed_args = self.parser.parse_args(args)
-            
-            # Convert to dictionary
-            args_dict = vars(parsed_args)
-            
-            # Handle stdin input
-            if args_dict.get('stdin'):
-                try:
-                    stdin_content = sys.stdin.read().strip()
-                    if stdin_content:
-                        args_dict['prompt'] = stdin_content
-                except Exception as e:
-                    self.logger.warning(f"Could not read from stdin: {e}")
-            
-            # Validate arguments
-            self._validate_arguments(args_dict)
-            
-            # Process file paths
-            if args_dict.get('input_files'):
-                args_dict['input_files'] = self._process_file_paths(args_dict['input_files'])
-            
-            return args_dict
-            
-        except SystemExit as e:
-            # Handle --help and --version
-            if e.code == 0:
-                sys.exit(0)
-            else:
-                raise AIAssistantError("Invalid command line arguments")
-                
-        except Exception as e:
-            self.logger.error(f"Argument parsing failed: {e}")
-            raise AIAssistantError(f"Failed to parse arguments: {e}")
-    
-    def _validate_arguments(self, args: Dict[str, Any]):
-        """Validate parsed arguments"""
-        try:
-            # Check for conflicting options
-            if args.get('interactive') and (args.get('input_files') or args.get('prompt')):
-                raise AIAssistantError("Interactive mode cannot be used with input files or prompts")
-            
-            # Validate model name
-            if args.get('model') and args['model'] != 'auto':
-                if self.config_manager:
-                    available_models = list(self.config_manager.models.keys())
-                    if args['model'] not in available_models:
-                        raise AIAssistantError(f"Invalid model: {args['model']}. Available: {available_models}")
-            
-            # Validate temperature
-            if args.get('temperature') is not None:
-                temp = args['temperature']
-                if not (0.0 <= temp <= 2.0):
-                    raise AIAssistantError("Temperature must be between 0.0 and 2.0")
-            
-            # Validate max_tokens
-            if args.get('max_tokens') is not None:
-                max_tokens = args['max_tokens']
-                if max_tokens <= 0:
-                    raise AIAssistantError("Max tokens must be positive")
-            
-            # Validate timeout
-            if args.get('timeout') is not None:
-                timeout = args['timeout']
-                if timeout <= 0:
-                    raise AIAssistantError("Timeout must be positive")
-            
-            # Check output directory
-            if args.get('output'):
-                output_path = Path(args['output'])
-                try:
-                    output_path.mkdir(parents=True, exist_ok=True)
-                except Exception as e:
-                    raise AIAssistantError(f"Cannot create output directory: {e}")
-            
-        except Exception as e:
-            raise AIAssistantError(f"Argument validation failed: {e}")
-    
-    def _process_file_paths(self, file_paths: List[str]) -> List[str]:
-        """Process and validate file paths with glob support"""
-        processed_files = []
-        
-        try:
-            for file_path in file_paths:
-                path = Path(file_path)
-                
-                # Handle glob patterns
-                if '*' in file_path or '?' in file_path:
-                    matches = list(Path('.').glob(file_path))
-                    for match in matches:
-                        if match.is_file():
-                            if self.file_validator.validate_file(match):
-                                processed_files.append(str(match.absolute()))
-                            else:
-                                self.logger.warning(f"File validation failed: {match}")
-                else:
-                    # Regular file path
-                    if path.exists() and path.is_file():
-                        if self.file_validator.validate_file(path):
-                            processed_files.append(str(path.absolute()))
-                        else:
-                            self.logger.warning(f"File validation failed: {path}")
-                    else:
-                        self.logger.warning(f"File not found: {path}")
-            
-            if not processed_files and file_paths:
-                raise AIAssistantError("No valid input files found")
-            
-            return processed_files
-            
-        except Exception as e:
-            raise AIAssistantError(f"File processing failed: {e}")
-    
-    async def show_help(self):
-        """Show interactive help"""
-        try:
-            help_text = """
+"""
+
+_HELP_TEXT = """
 🤖 AI Assistant CLI - Interactive Commands
 
 📝 Basic Commands:
@@ -443,42 +88,561 @@ Examples:
   load project.zip
   search "authentication logic"
   set model phi_4_reasoning
-            """
-            
-            print(self.formatter.format_info(help_text))
+"""
+
+# Accepted model temperature (inclusive)
+_TEMP_RANGE = (0.0, 2.0)
+
+# ANSI: erase display and move the cursor home
+_CLEAR_SCREEN = '\x1b[2J\x1b[H'
+
+# Path.glob, used before glob.iglob, matched dotfiles; iglob only does on 3.11+
+_GLOB_OPTIONS = {'recursive': True}
+if sys.version_info >= (3, 11):
+    _GLOB_OPTIONS['include_hidden'] = True
+
+# Single-flag invocations answered without a full argparse pass
+_FAST_FLAGS = {
+    '--list-models': 'list_models',
+    '--config-check': 'config_check',
+}
+
+def _temperature_type(value: str) -> float:
+    """argparse type: float within _TEMP_RANGE"""
+    try:
+        temp = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid temperature: {value!r}")
+    if not (_TEMP_RANGE[0] <= temp <= _TEMP_RANGE[1]):
+        raise argparse.ArgumentTypeError("temperature must be between 0.0 and 2.0")
+    return temp
+
+def _positive_int(value: str) -> int:
+    """argparse type: integer greater than zero"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive: {number}")
+    return number
+
+class _PlainFormatter:
+    """Identity formatter used when output is not a colour terminal"""
+    
+    @staticmethod
+    def _plain(text: str) -> str:
+        return text
+    
+    format_info = format_error = format_header = format_success = format_output = _plain
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once; it is shared by every CLIHandler"""
+    parser = argparse.ArgumentParser(
+        prog='ai-assistant',
+        description='🤖 AI Assistant CLI - Intelligent task automation and code generation',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG
+    )
+    
+    # Input options
+    input_group = parser.add_argument_group('Input Options')
+    input_group.add_argument(
+        '-f', '--files', '--input-files',
+        nargs='+',
+        dest='input_files',
+        help='Input files (zip, text, code files)',
+        metavar='FILE'
+    )
+    input_group.add_argument(
+        '-p', '--prompt',
+        type=str,
+        help='Task prompt or instruction',
+        metavar='TEXT'
+    )
+    input_group.add_argument(
+        '--stdin',
+        action='store_true',
+        help='Read prompt from stdin'
+    )
+    input_group.add_argument(
+        '--max-stdin-bytes',
+        type=_positive_int,
+        help='Maximum number of bytes to read from stdin',
+        metavar='BYTES'
+    )
+    
+    # Model options
+    model_group = parser.add_argument_group('Model Options')
+    model_group.add_argument(
+        '-m', '--model',
+        type=str,
+        default='auto',
+        help='Model to use (auto, devstral_small, llama_3_3_8b, phi_4_reasoning, deepseek_v3, qwen3_30b)',
+        metavar='MODEL'
+    )
+    model_group.add_argument(
+        '--temperature',
+        type=_temperature_type,
+        help='Model temperature (0.0-2.0)',
+        metavar='FLOAT'
+    )
+    model_group.add_argument(
+        '--max-tokens',
+        type=_positive_int,
+        help='Maximum tokens to generate',
+        metavar='INT'
+    )
+    
+    # Output options
+    output_group = parser.add_argument_group('Output Options')
+    output_group.add_argument(
+        '-o', '--output',
+        type=str,
+        default='./output',
+        help='Output directory',
+        metavar='DIR'
+    )
+    output_group.add_argument(
+        '--format',
+        choices=['text', 'json', 'markdown'],
+        default='text',
+        help='Output format'
+    )
+    output_group.add_argument(
+        '--save-session',
+        action='store_true',
+        help='Save session for later resume'
+    )
+    
+    # Task options
+    task_group = parser.add_argument_group('Task Options')
+    task_group.add_argument(
+        '--task-type',
+        choices=['coding', 'analysis', 'review', 'generation', 'research', 'auto'],
+        default='auto',
+        help='Task type for optimal model selection'
+    )
+    task_group.add_argument(
+        '--parallel',
+        action='store_true',
+        help='Enable parallel task execution'
+    )
+    task_group.add_argument(
+        '--memory',
+        action='store_true',
+        help='Enable memory and context retention'
+    )
+    task_group.add_argument(
+        '--search',
+        action='store_true',
+        help='Enable semantic search in input files'
+    )
+    
+    # Sandbox options
+    sandbox_group = parser.add_argument_group('Sandbox Options')
+    sandbox_group.add_argument(
+        '--sandbox',
+        action='store_true',
+        default=True,
+        help='Enable sandbox execution (default: True)'
+    )
+    sandbox_group.add_argument(
+        '--no-sandbox',
+        action='store_false',
+        dest='sandbox',
+        help='Disable sandbox execution (dangerous)'
+    )
+    sandbox_group.add_argument(
+        '--timeout',
+        type=_positive_int,
+        help='Task timeout in seconds',
+        metavar='SECONDS'
+    )
+    
+    # Code quality options
+    quality_group = parser.add_argument_group('Code Quality Options')
+    quality_group.add_argument(
+        '--lint',
+        action='store_true',
+        help='Enable code linting'
+    )
+    quality_group.add_argument(
+        '--format-code',
+        action='store_true',
+        help='Auto-format generated code'
+    )
+    quality_group.add_argument(
+        '--test',
+        action='store_true',
+        help='Generate and run tests'
+    )
+    
+    # Browser options
+    browser_group = parser.add_argument_group('Browser Options')
+    browser_group.add_argument(
+        '--browser',
+        action='store_true',
+        help='Enable browser automation for research'
+    )
+    browser_group.add_argument(
+        '--headless',
+        action='store_true',
+        default=True,
+        help='Run browser in headless mode'
+    )
+    
+    # Interactive mode
+    interactive_group = parser.add_argument_group('Interactive Mode')
+    interactive_group.add_argument(
+        '-i', '--interactive',
+        action='store_true',
+        help='Start in interactive mode'
+    )
+    interactive_group.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep running and serve later invocations over a local socket'
+    )
+    interactive_group.add_argument(
+        '--no-color',
+        action='store_true',
+        help='Disable colored output'
+    )
+    interactive_group.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Quiet mode - minimal output'
+    )
+    
+    # Configuration and info
+    config_group = parser.add_argument_group('Configuration')
+    config_group.add_argument(
+        '--config-check',
+        action='store_true',
+        help='Check configuration and model connectivity'
+    )
+    config_group.add_argument(
+        '--list-models',
+        action='store_true',
+        help='List available models and their capabilities'
+    )
+    config_group.add_argument(
+        '--config-file',
+        type=str,
+        help='Custom configuration file path',
+        metavar='FILE'
+    )
+    config_group.add_argument(
+        '--reset-config',
+        action='store_true',
+        help='Reset configuration to defaults'
+    )
+    
+    # Debugging and logging
+    debug_group = parser.add_argument_group('Debugging')
+    debug_group.add_argument(
+        '--debug',
+        action='store_true',
+        help='Enable debug logging'
+    )
+    debug_group.add_argument(
+        '--log-file',
+        type=str,
+        help='Custom log file path',
+        metavar='FILE'
+    )
+    debug_group.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Show what would be done without executing'
+    )
+    
+    # Version and help
+    parser.add_argument(
+        '--version',
+        action='version',
+        version=VERSION
+    )
+    
+    return parser
+
+@functools.lru_cache(maxsize=1)
+def _default_args() -> Dict[str, Any]:
+    """Default value of every option, read from the parser without a parse pass
+    
+    argparse would pass string defaults through type=, but those options all
+    use type=str, so these are the values parse_args([]) gives.
+    """
+    return {
+        action.dest: action.default
+        for action in _build_parser()._actions
+        if action.default is not argparse.SUPPRESS
+    }
+
+@dataclass(slots=True)
+class BatchArgs:
+    """The parsed arguments batch mode uses"""
+    input_files: List[str] = field(default_factory=list)
+    prompt: str = ''
+    output_dir: str = './output'
+    model: str = 'auto'
+    
+    @classmethod
+    def from_args(cls, args: Dict[str, Any]) -> 'BatchArgs':
+        """Pick the batch fields out of a parse_arguments() result
+        
+        argparse stores None for options that were not given, and -o is
+        stored under 'output'.
+        """
+        return cls(
+            input_files=args.get('input_files') or [],
+            prompt=args.get('prompt') or '',
+            output_dir=args.get('output') or './output',
+            model=args.get('model') or 'auto'
+        )
+
+class CLIHandler:
+    """Command-line interface handler"""
+    
+    def __init__(self, assistant=None, config_manager: "ConfigManager" = None, logger=None):
+        self.assistant = assistant
+        self.config_manager = config_manager
+        self.logger = logger or logging.getLogger(__name__)
+        self._formatter = None
+        self._no_color = False
+        self._progress = None
+        self._file_validator = None
+        self._validate_cached = functools.lru_cache(maxsize=512)(self._validate_file)
+        self._valid_models_source = None
+        self._valid_models: frozenset = frozenset()
+        try:
+            self.parser = _build_parser()
+        except argparse.ArgumentError as e:
+            self.logger.error(f"Failed to setup argument parser: {e}")
+            raise AIAssistantError(f"CLI setup failed: {e}")
+    
+    # UI helpers are imported on first use so --help/--version never load them
+    @property
+    def formatter(self):
+        """Output formatter (created on first access)"""
+        if self._formatter is None:
+            if self._no_color or not sys.stdout.isatty():
+                self._formatter = _PlainFormatter()
+            else:
+                from ui.formatter import ColorFormatter
+                self._formatter = ColorFormatter()
+        return self._formatter
+    
+    @property
+    def progress(self):
+        """Progress display (created on first access)"""
+        if self._progress is None:
+            from ui.progress_display import ProgressDisplay
+            self._progress = ProgressDisplay()
+        return self._progress
+    
+    @property
+    def file_validator(self):
+        """File validator (created on first access)"""
+        if self._file_validator is None:
+            from utils.file_utils import FileValidator
+            self._file_validator = FileValidator()
+        return self._file_validator
+    
+    def parse_arguments(self, args: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Parse command line arguments"""
+        if args is None:
+            args = sys.argv[1:]
+        
+        # Handle special cases
+        if not args:
+            return {'interactive': True}
+        
+        # Fast path for the common single-flag commands
+        if len(args) == 1:
+            if args[0] == '--version':
+                print(VERSION)
+                sys.exit(0)
             
-        except Exception as e:
-            self.logger.error(f"Failed to show help: {e}")
+            fast_dest = _FAST_FLAGS.get(args[0])
+            if fast_dest:
+                args_dict = dict(_default_args())
+                args_dict[fast_dest] = True
+                self._validate_arguments(args_dict)
+                return args_dict
+        
+        try:
+            parsed_args = self.parser.parse_args(args)
+        except SystemExit as e:
+            # --help exits with 0; anything else is a usage error
+            if e.code == 0:
+                raise
+            raise AIAssistantError("Invalid command line arguments")
+        
+        # Convert to dictionary
+        args_dict = vars(parsed_args)
+        
+        if args_dict.get('no_color') and not self._no_color:
+            self._no_color = True
+            self._formatter = None
+        
+        # Handle stdin input
+        if args_dict.get('stdin'):
+            try:
+                stdin_content = self._read_stdin(args_dict.get('max_stdin_bytes'))
+                if stdin_content:
+                    args_dict['prompt'] = stdin_content
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Could not read from stdin: {e}")
+        
+        # Validate arguments
+        self._validate_arguments(args_dict)
+        
+        # Process file paths
+        if args_dict.get('input_files'):
+            args_dict['input_files'] = self._process_file_paths(args_dict['input_files'])
+        
+        return args_dict
+    
+    def _read_stdin(self, max_bytes: Optional[int] = None) -> str:
+        """Read the prompt from stdin as raw bytes and decode it once"""
+        stream = getattr(sys.stdin, 'buffer', None)
+        if stream is None:
+            # stdin replaced by a text-only stream
+            return sys.stdin.read().strip()
+        
+        if max_bytes is None:
+            data = stream.read()
+        else:
+            data = stream.read(max_bytes + 1)
+            if len(data) > max_bytes:
+                self.logger.warning(f"stdin input truncated to {max_bytes} bytes")
+                data = data[:max_bytes]
+        
+        return data.strip().decode('utf-8', errors='replace')
+    
+    def _validate_arguments(self, args: Dict[str, Any]):
+        """Validate parsed arguments"""
+        # Check for conflicting options
+        if args.get('interactive') and (args.get('input_files') or args.get('prompt')):
+            raise AIAssistantError("Interactive mode cannot be used with input files or prompts")
+        
+        # Validate model name
+        model = args.get('model')
+        if model and model != 'auto' and self.config_manager:
+            valid_models = self._get_valid_models()
+            if model not in valid_models:
+                raise AIAssistantError(f"Invalid model: {model}. Available: {sorted(valid_models)}")
+        
+        # Numeric ranges are checked by the argparse type= callables
+        
+        # Check output directory
+        output = args.get('output')
+        if output:
+            try:
+                os.makedirs(output, exist_ok=True)
+            except OSError as e:
+                raise AIAssistantError(f"Cannot create output directory: {e}")
+    
+    def _get_valid_models(self) -> frozenset:
+        """Configured model names, rebuilt only when the models dict changes"""
+        models = self.config_manager.models
+        if models is not self._valid_models_source or len(models) != len(self._valid_models):
+            self._valid_models = frozenset(models)
+            self._valid_models_source = models
+        return self._valid_models
+    
+    def _process_file_paths(self, file_paths: List[str]) -> List[str]:
+        """Process and validate file paths with glob support"""
+        processed_files = []
+        append = processed_files.append
+        check_file = self._check_file
+        warning = self.logger.warning
+        
+        for file_path in file_paths:
+            # Handle glob patterns (*, ? and [...] classes). An existing path
+            # is taken literally, so names like pages/[id].tsx still work.
+            if glob.has_magic(file_path) and not os.path.lexists(file_path):
+                for match in glob.iglob(file_path, **_GLOB_OPTIONS):
+                    abs_path = os.path.abspath(match)
+                    valid = check_file(abs_path)
+                    if valid:
+                        append(abs_path)
+                    elif valid is not None:
+                        warning(f"File validation failed: {match}")
+            else:
+                # Regular file path
+                abs_path = os.path.abspath(file_path)
+                valid = check_file(abs_path)
+                if valid:
+                    append(abs_path)
+                elif valid is None:
+                    warning(f"File not found: {file_path}")
+                else:
+                    warning(f"File validation failed: {file_path}")
+        
+        if not processed_files and file_paths:
+            raise AIAssistantError("No valid input files found")
+        
+        return processed_files
+    
+    def _check_file(self, abs_path: str) -> Optional[bool]:
+        """Validate a file, reusing the result until the file is modified
+        
+        Returns None if the path is not an existing regular file.
+        """
+        try:
+            st = os.stat(abs_path)
+        except OSError:
+            return None
+        
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        
+        # mtime alone misses a same-tick rewrite or a file replaced by rename
+        return self._validate_cached(abs_path, st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    def _validate_file(self, path: str, mtime_ns: int, size: int, inode: int) -> bool:
+        """Run the file validator (the stat fields only key the cache)"""
+        return self.file_validator.validate_file(Path(path))
+    
+    async def show_help(self):
+        """Show interactive help"""
+        print(self.formatter.format_info(_HELP_TEXT))
     
     async def check_configuration(self) -> bool:
         """Check configuration and connectivity"""
+        # Output is collected and written in one go at the end
+        lines: List[str] = []
         try:
             if not self.config_manager:
                 print(self.formatter.format_error("❌ Configuration manager not available"))
                 return False
             
-            print(self.formatter.format_header("🔧 Configuration Check"))
+            lines.append(self.formatter.format_header("🔧 Configuration Check"))
             
             # Check basic configuration
-            print(self.formatter.format_info("📋 Basic Configuration:"))
-            print(f"  Models configured: {len(self.config_manager.models)}")
-            print(f"  Sandbox enabled: {self.config_manager.sandbox}")
-            print(f"  Memory enabled: {self.config_manager.memory}")
-            print(f"  Security enabled: {self.config_manager.security}")
-            
-            # Check model connectivity
-            print(self.formatter.format_info("\n🌐 Model Connectivity:"))
+            lines.append(self.formatter.format_info("📋 Basic Configuration:"))
+            lines.append(f"  Models configured: {len(self.config_manager.models)}")
+            lines.append(f"  Sandbox enabled: {self.config_manager.sandbox}")
+            lines.append(f"  Memory enabled: {self.config_manager.memory}")
+            lines.append(f"  Security enabled: {self.config_manager.security}")
+            
+            # Check model connectivity (probes run concurrently on one session)
+            lines.append(self.formatter.format_info("\n🌐 Model Connectivity:"))
             connectivity_results = await self.config_manager.check_model_connectivity()
             
             all_connected = True
             for model_name, connected in connectivity_results.items():
                 status = "✅ Connected" if connected else "❌ Failed"
-                print(f"  {model_name}: {status}")
+                lines.append(f"  {model_name}: {status}")
                 if not connected:
                     all_connected = False
             
             # Check directories
-            print(self.formatter.format_info("\n📁 Directory Check:"))
+            lines.append(self.formatter.format_info("\n📁 Directory Check:"))
             directories = [
                 ("Sandbox", self.config_manager.sandbox.workspace_dir),
                 ("Database", Path(self.config_manager.database.path).parent),
@@ -486,151 +650,220 @@ Examples:
                 ("Logs", self.config_manager.logging.log_dir)
             ]
             
-            for name, path in directories:
-                path_obj = Path(path)
-                if path_obj.exists():
-                    print(f"  {name}: ✅ {path}")
+            import asyncio
+            directory_results = await asyncio.gather(
+                *(asyncio.to_thread(self._ensure_directory, Path(path)) for _, path in directories),
+                return_exceptions=True
+            )
+            
+            for (name, path), created in zip(directories, directory_results):
+                if isinstance(created, Exception):
+                    lines.append(f"  {name}: ❌ Failed to create {path} - {created}")
+                    all_connected = False
+                elif created:
+                    lines.append(f"  {name}: ✅ Created {path}")
                 else:
-                    try:
-                        path_obj.mkdir(parents=True, exist_ok=True)
-                        print(f"  {name}: ✅ Created {path}")
-                    except Exception as e:
-                        print(f"  {name}: ❌ Failed to create {path} - {e}")
-                        all_connected = False
+                    lines.append(f"  {name}: ✅ {path}")
             
             # Overall status
             if all_connected:
-                print(self.formatter.format_success("\n✅ Configuration check passed"))
+                lines.append(self.formatter.format_success("\n✅ Configuration check passed"))
             else:
-                print(self.formatter.format_error("\n❌ Configuration check failed"))
-                
+                lines.append(self.formatter.format_error("\n❌ Configuration check failed"))
+            
+            print('\n'.join(lines))
             return all_connected
             
         except Exception as e:
             self.logger.error(f"Configuration check failed: {e}")
-            print(self.formatter.format_error(f"❌ Configuration check error: {e}"))
+            lines.append(self.formatter.format_error(f"❌ Configuration check error: {e}"))
+            print('\n'.join(lines))
+            return False
+    
+    @staticmethod
+    def _ensure_directory(path: Path) -> bool:
+        """Create a directory if missing; returns True if it was created"""
+        if path.exists():
             return False
+        path.mkdir(parents=True, exist_ok=True)
+        return True
     
     async def list_models(self):
         """List available models and their capabilities"""
-        try:
-            if not self.config_manager:
-                print(self.formatter.format_error("❌ Configuration manager not available"))
-                return
-            
-            print(self.formatter.format_header("🤖 Available Models"))
-            
-            for model_name, model_config in self.config_manager.models.items():
-                status = "✅ Enabled" if model_config.enabled else "❌ Disabled"
-                print(f"\n📍 {model_name}")
-                print(f"  Status: {status}")
-                print(f"  Model: {model_config.model}")
-                print(f"  Max Tokens: {model_config.max_tokens:,}")
-                print(f"  Temperature: {model_config.temperature}")
-                print(f"  Capabilities: {', '.join(model_config.capabilities)}")
-                print(f"  Details: {model_config.details[:100]}...")
-            
-            # Show recommended usage
-            print(self.formatter.format_info("\n💡 Recommended Usage:"))
-            recommendations = [
-                ("Coding Tasks", "devstral_small, phi_4_reasoning"),
-                ("Math/Reasoning", "phi_4_reasoning, qwen3_30b"),
-                ("General Chat", "deepseek_v3, llama_3_3_8b"),
-                ("Fast Response", "llama_3_3_8b"),
-                ("Agent Tasks", "devstral_small, qwen3_30b"),
-                ("Multilingual", "qwen3_30b, deepseek_v3")
-            ]
-            
-            for task_type, models in recommendations:
-                print(f"  {task_type}: {models}")
-                
-        except Exception as e:
-            self.logger.error(f"Failed to list models: {e}")
-            print(self.formatter.format_error(f"❌ Error listing models: {e}"))
+        if not self.config_manager:
+            print(self.formatter.format_error("❌ Configuration manager not available"))
+            return
+        
+        lines = [self.formatter.format_header("🤖 Available Models")]
+        
+        for model_name, model_config in self.config_manager.models.items():
+            status = "✅ Enabled" if model_config.enabled else "❌ Disabled"
+            lines.append(
+                f"\n📍 {model_name}\n"
+                f"  Status: {status}\n"
+                f"  Model: {model_config.model}\n"
+                f"  Max Tokens: {model_config.max_tokens:,}\n"
+                f"  Temperature: {model_config.temperature}\n"
+                f"  Capabilities: {', '.join(sorted(model_config.capabilities))}\n"
+                f"  Details: {model_config.details[:100]}..."
+            )
+        
+        # Show recommended usage
+        lines.append(self.formatter.format_info("\n💡 Recommended Usage:"))
+        recommendations = [
+            ("Coding Tasks", "devstral_small, phi_4_reasoning"),
+            ("Math/Reasoning", "phi_4_reasoning, qwen3_30b"),
+            ("General Chat", "deepseek_v3, llama_3_3_8b"),
+            ("Fast Response", "llama_3_3_8b"),
+            ("Agent Tasks", "devstral_small, qwen3_30b"),
+            ("Multilingual", "qwen3_30b, deepseek_v3")
+        ]
+        
+        for task_type, models in recommendations:
+            lines.append(f"  {task_type}: {models}")
+        
+        print('\n'.join(lines))
     
     async def handle_interactive_command(self, command: str) -> Dict[str, Any]:
         """Handle interactive mode commands"""
+        # Only the command word is split off; handlers get the rest verbatim
+        parts = command.split(None, 1)
+        if not parts:
+            return {'success': False, 'error': 'Empty command'}
+        
+        # Table keys are literals (already interned); interning the parsed
+        # word lets the lookup succeed on the identity check
+        cmd = sys.intern(parts[0].lower())
+        rest = parts[1].strip() if len(parts) > 1 else ''
+        
+        handler = self._CMD_TABLE.get(cmd)
+        result = await handler(self, rest) if handler else None
+        
+        # Unknown command (or known command with missing arguments)
+        if result is None:
+            return {'success': False, 'error': f'Unknown command: {cmd}. Type "help" for available commands.'}
+        
+        return result
+    
+    # Interactive command handlers: receive the text after the command word and
+    # return a result dict, or None when the command is not applicable to it
+    
+    async def _cmd_help(self, rest: str) -> Optional[Dict[str, Any]]:
+        """help, ?"""
+        await self.show_help()
+        return {'success': True}
+    
+    async def _cmd_clear(self, rest: str) -> Optional[Dict[str, Any]]:
+        """clear"""
+        if not sys.stdout.isatty():
+            return {'success': True}
+        
+        if os.name == 'nt':
+            # Legacy Windows consoles may not process ANSI escapes
+            os.system('cls')
+        else:
+            sys.stdout.write(_CLEAR_SCREEN)
+            sys.stdout.flush()
+        return {'success': True}
+    
+    async def _cmd_config(self, rest: str) -> Optional[Dict[str, Any]]:
+        """config"""
+        await self.check_configuration()
+        return {'success': True}
+    
+    async def _cmd_models(self, rest: str) -> Optional[Dict[str, Any]]:
+        """models"""
+        await self.list_models()
+        return {'success': True}
+    
+    async def _cmd_status(self, rest: str) -> Optional[Dict[str, Any]]:
+        """status"""
+        if self.assistant:
+            import json
+            try:
+                status = await self.assistant.get_status()
+            except AIAssistantError as e:
+                return {'success': False, 'error': f'Command error: {e}'}
+            print(json.dumps(status, indent=2))
+        return {'success': True}
+    
+    async def _cmd_set(self, rest: str) -> Optional[Dict[str, Any]]:
+        """set <setting> <value>"""
+        parts = rest.split(None, 1)
+        if len(parts) < 2:
+            return None
+        
+        setter = self._SET_TABLE.get(sys.intern(parts[0].lower()))
+        return setter(self, parts[1]) if setter else None
+    
+    async def _cmd_load(self, rest: str) -> Optional[Dict[str, Any]]:
+        """load <file>"""
+        if not rest:
+            return None
+        
+        file_path = rest
+        if Path(file_path).exists():
+            return {'success': True, 'action': 'load_file', 'value': file_path}
+        else:
+            return {'success': False, 'error': f'File not found: {file_path}'}
+    
+    async def _cmd_files(self, rest: str) -> Optional[Dict[str, Any]]:
+        """files"""
+        return {'success': True, 'action': 'list_files'}
+    
+    async def _cmd_task(self, rest: str) -> Optional[Dict[str, Any]]:
+        """task <prompt>"""
+        if not rest:
+            return None
+        
+        return {'success': True, 'action': 'execute_task', 'value': rest}
+    
+    async def _cmd_search(self, rest: str) -> Optional[Dict[str, Any]]:
+        """search <query>"""
+        if not rest:
+            return None
+        
+        return {'success': True, 'action': 'semantic_search', 'value': rest}
+    
+    def _set_model(self, value: str) -> Dict[str, Any]:
+        """set model <name>"""
+        if self.config_manager and value in self._get_valid_models():
+            # This would be handled by the assistant
+            return {'success': True, 'action': 'set_model', 'value': value}
+        else:
+            return {'success': False, 'error': f'Invalid model: {value}'}
+    
+    def _set_temperature(self, value: str) -> Dict[str, Any]:
+        """set temp <value>"""
         try:
-            parts = command.strip().split()
-            if not parts:
-                return {'success': False, 'error': 'Empty command'}
-            
-            cmd = parts[0].lower()
-            args = parts[1:] if len(parts) > 1 else []
-            
-            # Basic commands
-            if cmd in ['help', '?']:
-                await self.show_help()
-                return {'success': True}
-            
-            elif cmd == 'clear':
-                import os
-                os.system('cls' if os.name == 'nt' else 'clear')
-                return {'success': True}
-            
-            elif cmd == 'config':
-                await self.check_configuration()
-                return {'success': True}
-            
-            elif cmd == 'models':
-                await self.list_models()
-                return {'success': True}
-            
-            elif cmd == 'status':
-                if self.assistant:
-                    status = await self.assistant.get_status()
-                    print(json.dumps(status, indent=2))
-                return {'success': True}
-            
-            # Configuration commands
-            elif cmd == 'set' and len(args) >= 2:
-                setting = args[0].lower()
-                value = ' '.join(args[1:])
-                
-                if setting == 'model':
-                    if self.config_manager and value in self.config_manager.models:
-                        # This would be handled by the assistant
-                        return {'success': True, 'action': 'set_model', 'value': value}
-                    else:
-                        return {'success': False, 'error': f'Invalid model: {value}'}
-                
-                elif setting in ['temperature', 'temp']:
-                    try:
-                        temp_value = float(value)
-                        if 0.0 <= temp_value <= 2.0:
-                            return {'success': True, 'action': 'set_temperature', 'value': temp_value}
-                        else:
-                            return {'success': False, 'error': 'Temperature must be between 0.0 and 2.0'}
-                    except ValueError:
-                        return {'success': False, 'error': 'Invalid temperature value'}
-            
-            # File commands
-            elif cmd == 'load' and args:
-                file_path = ' '.join(args)
-                if Path(file_path).exists():
-                    return {'success': True, 'action': 'load_file', 'value': file_path}
-                else:
-                    return {'success': False, 'error': f'File not found: {file_path}'}
-            
-            elif cmd == 'files':
-                return {'success': True, 'action': 'list_files'}
-            
-            # Task commands
-            elif cmd == 'task' and args:
-                task_prompt = ' '.join(args)
-                return {'success': True, 'action': 'execute_task', 'value': task_prompt}
-            
-            elif cmd == 'search' and args:
-                search_query = ' '.join(args)
-                return {'success': True, 'action': 'semantic_search', 'value': search_query}
-            
-            # Unknown command
-            else:
-                return {'success': False, 'error': f'Unknown command: {cmd}. Type "help" for available commands.'}
-            
-        except Exception as e:
-            self.logger.error(f"Interactive command handling failed: {e}")
-            return {'success': False, 'error': f'Command error: {e}'}
+            temp_value = float(value)
+        except ValueError:
+            return {'success': False, 'error': 'Invalid temperature value'}
+        
+        if _TEMP_RANGE[0] <= temp_value <= _TEMP_RANGE[1]:
+            return {'success': True, 'action': 'set_temperature', 'value': temp_value}
+        else:
+            return {'success': False, 'error': 'Temperature must be between 0.0 and 2.0'}
+    
+    _CMD_TABLE = {
+        'help': _cmd_help,
+        '?': _cmd_help,
+        'clear': _cmd_clear,
+        'config': _cmd_config,
+        'models': _cmd_models,
+        'status': _cmd_status,
+        'set': _cmd_set,
+        'load': _cmd_load,
+        'files': _cmd_files,
+        'task': _cmd_task,
+        'search': _cmd_search,
+    }
+    
+    _SET_TABLE = {
+        'model': _set_model,
+        'temperature': _set_temperature,
+        'temp': _set_temperature,
+    }
     
     def get_parser(self) -> argparse.ArgumentParser:
         """Get the argument parser"""
@@ -3,18 +3,133 @@ Core Configuration Management
 """
 
 import os
+import stat
+import sys
+import hashlib
 import yaml
-import json
+import pickle
+import struct
 import asyncio
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
-from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass, field, fields, asdict
 from copy import deepcopy
+from functools import cached_property
+from types import MappingProxyType
 import logging
 
 from core.exceptions import ConfigurationError
 
-@dataclass
+# libyaml's C loader/dumper are several times faster; fall back to pure Python
+try:
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
+
+def _file_mode(path: Path, default: int = 0o600) -> int:
+    """Permission bits of path, or default if it does not exist"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return default
+
+def _open_private(tmp_path: Path, mode: int, text: bool = True):
+    """Create tmp_path with exactly the given permission bits and open it for writing"""
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        # os.open applies the umask; set the bits explicitly
+        os.chmod(tmp_path, mode)
+    except BaseException:
+        os.close(fd)
+        raise
+    if text:
+        return os.fdopen(fd, 'w', encoding='utf-8')
+    return os.fdopen(fd, 'wb')
+
+# Sidecar header: magic, st_mtime_ns, st_size, st_ino. It is compared as raw
+# bytes, so a stale or foreign .pkl is never unpickled.
+_SNAPSHOT_MAGIC = b'YPK1'
+_SNAPSHOT_HEADER = struct.Struct('<4sqQQ')
+
+def _load_yaml_cached(path: Path) -> Any:
+    """Load a YAML file, reusing a pickled snapshot while the file is unchanged
+    
+    The snapshot is stored next to the file as ``<name>.pkl`` with the same
+    permissions, and is keyed on the file's mtime, size and inode, so any
+    edit forces a fresh parse.
+    """
+    st = path.stat()
+    header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, st.st_mtime_ns, st.st_size, st.st_ino)
+    cache_path = path.with_name(path.name + '.pkl')
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            if f.read(_SNAPSHOT_HEADER.size) == header:
+                return pickle.load(f)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_SafeLoader)
+    
+    # Write to a temp file and swap it in so readers never see a partial snapshot
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with _open_private(tmp_path, stat.S_IMODE(st.st_mode), text=False) as f:
+            f.write(header)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only config directory: just skip the snapshot
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+    
+    return data
+
+def _clone_plain(value: Any) -> Any:
+    """Deep-copy YAML-style data (dicts, lists, scalars) without deepcopy's memo
+    
+    Anything else falls back to copy.deepcopy.
+    """
+    if isinstance(value, dict):
+        return {k: _clone_plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone_plain(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return deepcopy(value)
+
+def _dump_yaml(data: Any, path: Path):
+    """Write data as YAML, replacing the file atomically
+    
+    The new file keeps the old one's permissions; a new file is created 0600
+    since models.yaml can hold API keys.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with _open_private(tmp_path, _file_mode(path)) as f:
+            yaml.dump(data, f, Dumper=_SafeDumper, default_flow_style=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _intern_capabilities(capabilities: Iterable[str]) -> FrozenSet[str]:
+    """Capability set with interned names, shared across ModelConfig instances"""
+    return frozenset(sys.intern(c) for c in capabilities)
+
+def _model_to_dict(config: 'ModelConfig') -> Dict[str, Any]:
+    """asdict() with capabilities as a sorted list, which YAML can represent"""
+    model_dict = asdict(config)
+    model_dict['capabilities'] = sorted(config.capabilities)
+    return model_dict
+
+@dataclass(slots=True)
 class ModelConfig:
     """Model configuration dataclass"""
     name: str
@@ -28,9 +143,9 @@ class ModelConfig:
     retries: int = 3
     enabled: bool = True
     cost_per_token: float = 0.0
-    capabilities: List[str] = field(default_factory=list)
+    capabilities: FrozenSet[str] = field(default_factory=frozenset)
 
-@dataclass
+@dataclass(slots=True)
 class SandboxConfig:
     """Sandbox configuration"""
     workspace_dir: str = "./sandbox_workspaces"
@@ -49,7 +164,7 @@ class SandboxConfig:
         "disk_mb": 1024
     })
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseConfig:
     """Database configuration"""
     path: str = "./data/database.sqlite"
@@ -58,7 +173,7 @@ class DatabaseConfig:
     max_backups: int = 7
     connection_pool_size: int = 5
 
-@dataclass
+@dataclass(slots=True)
 class MemoryConfig:
     """Memory and ChromaDB configuration"""
     chromadb_path: str = "./data/embeddings"
@@ -68,7 +183,7 @@ class MemoryConfig:
     similarity_threshold: float = 0.7
     collection_name: str = "ai_assistant_memory"
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     """Logging configuration"""
     level: str = "INFO"
@@ -79,7 +194,7 @@ class LoggingConfig:
     enable_console: bool = True
     enable_file: bool = True
 
-@dataclass
+@dataclass(slots=True)
 class SecurityConfig:
     """Security settings"""
     api_key_encryption: bool = True
@@ -89,7 +204,7 @@ class SecurityConfig:
     network_restrictions: bool = True
     max_request_size_mb: int = 50
 
-@dataclass
+@dataclass(slots=True)
 class UIConfig:
     """UI and interaction settings"""
     interactive_mode: bool = True
@@ -99,57 +214,368 @@ class UIConfig:
     auto_save_sessions: bool = True
     session_timeout_minutes: int = 60
 
+# Field names accepted from policy files and update_model_config
+_SECURITY_FIELDS = frozenset(f.name for f in fields(SecurityConfig))
+_MODEL_FIELDS = frozenset(f.name for f in fields(ModelConfig))
+
+# Models written to a fresh models.yaml. API keys are deliberately absent:
+# they come from the OPENROUTER_API_KEY environment variable at load time.
+_OPENROUTER_URL = 'https://openrouter.ai/api/v1'
+_API_KEY_ENV = 'OPENROUTER_API_KEY'
+
+_DEFAULT_MODELS = MappingProxyType({
+    'devstral_small': MappingProxyType({
+        'base_url': _OPENROUTER_URL,
+        'model': 'mistralai/devstral-small:free',
+        'details': 'Devstral-Small-2505 is a 24B parameter agentic LLM fine-tuned from Mistral-Small-3.1, jointly developed by Mistral AI and All Hands AI for advanced software engineering tasks.',
+        'max_tokens': 128000,
+        'temperature': 0.7,
+        'capabilities': ('coding', 'agents', 'file_editing')
+    }),
+    'llama_3_3_8b': MappingProxyType({
+        'base_url': _OPENROUTER_URL,
+        'model': 'meta-llama/llama-3.3-8b-instruct:free',
+        'details': 'A lightweight and ultra-fast variant of Llama 3.3 70B, for use when quick response times are needed most.',
+        'max_tokens': 128000,
+        'temperature': 0.7,
+        'capabilities': ('general', 'fast_response')
+    }),
+    'phi_4_reasoning': MappingProxyType({
+        'base_url': _OPENROUTER_URL,
+        'model': 'microsoft/phi-4-reasoning-plus:free',
+        'details': 'Phi-4-reasoning-plus is an enhanced 14B parameter model from Microsoft, fine-tuned with additional reinforcement learning to boost accuracy on math, science, and code reasoning tasks.',
+        'max_tokens': 128000,
+        'temperature': 0.3,
+        'capabilities': ('reasoning', 'math', 'science', 'coding')
+    }),
+    'deepseek_v3': MappingProxyType({
+        'base_url': _OPENROUTER_URL,
+        'model': 'deepseek/deepseek-chat-v3-0324:free',
+        'details': 'DeepSeek V3, a 685B-parameter, mixture-of-experts model, is the latest iteration of the flagship chat model family.',
+        'max_tokens': 163840,
+        'temperature': 0.7,
+        'capabilities': ('general', 'conversation', 'large_context')
+    }),
+    'qwen3_30b': MappingProxyType({
+        'base_url': _OPENROUTER_URL,
+        'model': 'qwen/qwen3-30b-a3b:free',
+        'details': 'Qwen3 features both dense and mixture-of-experts (MoE) architectures to excel in reasoning, multilingual support, and advanced agent tasks.',
+        'max_tokens': 131072,
+        'temperature': 0.7,
+        'capabilities': ('reasoning', 'multilingual', 'agents', 'creative_writing')
+    })
+})
+
+# tools.yaml sections copied into custom_settings
+_TOOL_SECTIONS = ('code_quality', 'browser')
+
+# Preferred models per task type, best first
+_TASK_MODEL_PREFS: Dict[str, Tuple[str, ...]] = {
+    'coding': ('devstral_small', 'phi_4_reasoning'),
+    'reasoning': ('phi_4_reasoning', 'qwen3_30b'),
+    'general': ('deepseek_v3', 'llama_3_3_8b'),
+    'fast': ('llama_3_3_8b',),
+    'agents': ('devstral_small', 'qwen3_30b'),
+    'multilingual': ('qwen3_30b', 'deepseek_v3'),
+}
+
+# Properties whose value lives in a differently named attribute
+_BACKING_ATTRS = {'sandbox': '_sandbox', 'security': '_security'}
+
+# ConfigManager attribute -> settings.yaml section it is saved under
+_SETTINGS_SECTIONS = {
+    'sandbox': 'sandbox',
+    'database': 'database',
+    'memory': 'memory',
+    'logging': 'logging',
+    'security': 'security',
+    'ui': 'ui',
+    'custom_settings': 'custom',
+}
+
+# Attributes load_config() fills in, as stored by ConfigCache. The backing
+# attributes are used so security policies are re-applied after a restore.
+_SNAPSHOT_ATTRS = ('_sandbox', 'database', 'memory', 'logging', '_security', 'ui', 'custom_settings')
+
+# Field layout of the pickled section classes. It is part of the cache
+# digest, so a snapshot written before a field was added or changed is
+# never restored into the new classes.
+_SNAPSHOT_SCHEMA = repr([
+    (cls.__name__, [(f.name, str(f.type)) for f in fields(cls)])
+    for cls in (SandboxConfig, DatabaseConfig, MemoryConfig, LoggingConfig, SecurityConfig, UIConfig)
+]).encode()
+
+class ConfigCache:
+    """On-disk cache of loaded settings, keyed on a digest of the config files
+    
+    A hit restores the ConfigManager with load_from_cache() and skips YAML
+    parsing; a miss runs load_config() and stores the result.
+    """
+    
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.cache_dir = Path(cache_dir)
+        self.logger = logging.getLogger(__name__)
+    
+    async def load(self, config_manager: 'ConfigManager'):
+        """Load config_manager's settings, from the cache when it is current"""
+        if await asyncio.to_thread(self._restore, config_manager):
+            return
+        await config_manager.load_config()
+        await asyncio.to_thread(self._store, config_manager)
+    
+    def _cache_path(self, digest: str) -> Path:
+        return self.cache_dir / f"config-{digest}.pkl"
+    
+    def _restore(self, config_manager: 'ConfigManager') -> bool:
+        """Restore from the cache; False on a miss or an unreadable entry"""
+        digest = config_manager.config_digest()
+        if digest is None:
+            return False
+        try:
+            with open(self._cache_path(digest), 'rb') as f:
+                snapshot = pickle.load(f)
+        except (OSError, EOFError, ValueError, AttributeError, pickle.UnpicklingError):
+            return False
+        config_manager.load_from_cache(snapshot)
+        return True
+    
+    def _store(self, config_manager: 'ConfigManager'):
+        """Write the loaded settings and drop entries for older file contents"""
+        digest = config_manager.config_digest()
+        if digest is None:
+            return
+        cache_path = self._cache_path(digest)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # The snapshot holds what settings.yaml does, so it gets the same mode
+            with _open_private(tmp_path, _file_mode(config_manager._settings_path), text=False) as f:
+                pickle.dump(config_manager.snapshot(), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            for stale in self.cache_dir.glob('config-*.pkl'):
+                if stale != cache_path:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            self.logger.warning(f"Could not write config cache: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
 class ConfigManager:
-    """Main configuration manager"""
+    """Main configuration manager
+    
+    save_config() only rewrites sections that changed since they were loaded
+    or last saved. Replacing a section (``config.ui = UIConfig(...)``),
+    update_model_config() and set_setting() mark it dirty directly; edits
+    made in place (``config.sandbox.max_workspaces = 20``) are found by
+    comparing each section with its last saved state.
+    """
     
     def __init__(self, config_dir: Union[str, Path]):
-        self.config_dir = Path(config_dir)
-        self.models: Dict[str, ModelConfig] = {}
-        self.sandbox: SandboxConfig = SandboxConfig()
+        self._dirty: Set[str] = set()
+        # Resolved once so derived paths stay valid if the CWD changes
+        self.config_dir = Path(config_dir).resolve()
+        self._settings_path = self.config_dir / "settings.yaml"
+        self._models_path = self.config_dir / "models.yaml"
+        self._tools_path = self.config_dir / "tools.yaml"
+        self._security_path = self.config_dir / "security_policies.yaml"
+        # models is a cached_property: models.yaml is read on first access
+        self._sandbox: SandboxConfig = SandboxConfig()
         self.database: DatabaseConfig = DatabaseConfig()
         self.memory: MemoryConfig = MemoryConfig()
         self.logging: LoggingConfig = LoggingConfig()
-        self.security: SecurityConfig = SecurityConfig()
+        self._security: SecurityConfig = SecurityConfig()
         self.ui: UIConfig = UIConfig()
         self.custom_settings: Dict[str, Any] = {}
+        # Sections ('sandbox', 'security') security_policies.yaml is still to patch
+        self._policies_pending: Set[str] = set(_BACKING_ATTRS)
+        self._best_model_cache: Dict[Union[str, Tuple[str, FrozenSet[str]]], Optional[ModelConfig]] = {}
+        self._enabled_cache: Optional[Dict[str, ModelConfig]] = None
+        # Section name -> plain data as last loaded or saved
+        self._saved_state: Dict[str, Any] = {}
         self.logger = logging.getLogger(__name__)
+        self._dirty.clear()
+    
+    def __setattr__(self, name: str, value: Any):
+        section = _SETTINGS_SECTIONS.get(name)
+        if section is not None:
+            self._dirty.add(section)
+        elif name == 'models':
+            # A replaced models dict invalidates everything derived from it
+            self._dirty.add('models')
+            self.invalidate_model_caches()
+        super().__setattr__(name, value)
+    
+    def _section_state(self, attr: str) -> Any:
+        """Plain data of a settings section, for change detection
+        
+        Reads the backing attributes of sandbox/security so this never
+        triggers loading the security policies.
+        """
+        value = getattr(self, _BACKING_ATTRS.get(attr, attr))
+        return _clone_plain(value) if attr == 'custom_settings' else asdict(value)
+    
+    @staticmethod
+    def _models_state(models: Dict[str, ModelConfig]) -> Dict[str, Any]:
+        return {name: _model_to_dict(config) for name, config in models.items()}
+    
+    def _remember_saved_state(self):
+        """Record the loaded settings sections as matching the files on disk"""
+        for attr, section in _SETTINGS_SECTIONS.items():
+            self._saved_state[section] = self._section_state(attr)
+    
+    def mark_dirty(self, *sections: str):
+        """Mark sections ('models', 'custom', 'ui', ...) for the next save_config"""
+        self._dirty.update(sections)
+    
+    @cached_property
+    def models(self) -> Dict[str, ModelConfig]:
+        """Model configurations, loaded from models.yaml on first access"""
+        models = self._load_model_configs()
+        self._saved_state['models'] = self._models_state(models)
+        return models
+    
+    def invalidate_models(self):
+        """Drop the loaded models so the next access re-reads models.yaml"""
+        self.__dict__.pop('models', None)
+        self._saved_state.pop('models', None)
+        self.invalidate_model_caches()
+    
+    def invalidate_model_caches(self):
+        """Forget results derived from the models' enabled flags
+        
+        Call after editing a loaded ModelConfig in place (e.g. ``enabled``);
+        unlike invalidate_models() this keeps unsaved edits.
+        """
+        self._best_model_cache.clear()
+        self._enabled_cache = None
+    
+    # security_policies.yaml only patches these two sections, so it is applied
+    # the first time either one is read
+    @property
+    def sandbox(self) -> SandboxConfig:
+        """Sandbox settings with security policies applied"""
+        self._apply_security_policies()
+        return self._sandbox
+    
+    @sandbox.setter
+    def sandbox(self, value: SandboxConfig):
+        self._sandbox = value
+        self._policies_pending.add('sandbox')
+    
+    @property
+    def security(self) -> SecurityConfig:
+        """Security settings with security policies applied"""
+        self._apply_security_policies()
+        return self._security
+    
+    @security.setter
+    def security(self, value: SecurityConfig):
+        self._security = value
+        self._policies_pending.add('security')
         
     async def load_config(self):
         """Load configuration from files"""
+        # Create config directory if it doesn't exist
         try:
-            # Create config directory if it doesn't exist
             self.config_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Load main settings
-            await self._load_main_settings()
-            
-            # Load model configurations
-            await self._load_model_configs()
-            
-            # Load tool configurations
-            await self._load_tool_configs()
-            
-            # Load security policies
-            await self._load_security_policies()
-            
-            # Validate configuration
-            await self._validate_config()
-            
-            self.logger.info("Configuration loaded successfully")
-            
-        except Exception as e:
-            raise ConfigurationError(f"Failed to load configuration: {e}")
+        except OSError as e:
+            raise ConfigurationError(f"Failed to load configuration: {e}") from e
+        
+        # Start from the defaults so a reload reflects only what the files say
+        self._reset_settings()
+        
+        # File loads are blocking, so run them in a worker thread. Tool
+        # settings patch custom_settings, so they load after settings.yaml.
+        # Models and security policies are loaded lazily on first access.
+        # The loaders raise ConfigurationError themselves.
+        await asyncio.to_thread(self._load_main_settings)
+        await asyncio.to_thread(self._load_tool_configs)
+        
+        # Validate configuration
+        self._validate_config()
+        
+        # What was just loaded matches the files on disk
+        self._dirty.clear()
+        self._remember_saved_state()
+        
+        self.logger.info("Configuration loaded successfully")
+    
+    def _reset_settings(self):
+        """Return every section to its defaults and forget the loaded models"""
+        self._sandbox = SandboxConfig()
+        self.database = DatabaseConfig()
+        self.memory = MemoryConfig()
+        self.logging = LoggingConfig()
+        self._security = SecurityConfig()
+        self.ui = UIConfig()
+        self.custom_settings = {}
+        self._policies_pending = set(_BACKING_ATTRS)
+        self.invalidate_models()
     
-    async def _load_main_settings(self):
+    def config_version(self) -> Tuple[Any, ...]:
+        """Value that changes whenever reloading could give different settings
+        
+        The files load_config() reads are compared by config_digest(); the
+        lazily loaded models.yaml and security_policies.yaml by their stat.
+        """
+        version: List[Any] = [self.config_digest()]
+        for path in (self._models_path, self._security_path):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                version.append(None)
+            else:
+                version.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        return tuple(version)
+    
+    def config_digest(self) -> Optional[str]:
+        """blake2b digest of the files load_config() reads and the section schema
+        
+        Returns None while settings.yaml does not exist yet.
+        """
+        digest = hashlib.blake2b(_SNAPSHOT_SCHEMA, digest_size=16)
+        for path in (self._settings_path, self._tools_path):
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                if path == self._settings_path:
+                    return None
+                data = b''
+            digest.update(f"{path.name}:{len(data)}:".encode())
+            digest.update(data)
+        return digest.hexdigest()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Settings as loaded by load_config(), for load_from_cache()"""
+        return {attr: getattr(self, attr) for attr in _SNAPSHOT_ATTRS}
+    
+    def load_from_cache(self, snapshot: Dict[str, Any]):
+        """Restore settings from snapshot() output instead of parsing the files
+        
+        Directories are still validated: they are not covered by the digest.
+        """
+        for attr in _SNAPSHOT_ATTRS:
+            setattr(self, attr, snapshot[attr])
+        self._policies_pending = set(_BACKING_ATTRS)
+        self.invalidate_models()
+        self._validate_config()
+        self._dirty.clear()
+        self._remember_saved_state()
+        self.logger.info("Configuration loaded from cache")
+    
+    def _load_main_settings(self):
         """Load main settings from settings.yaml"""
-        settings_file = self.config_dir / "settings.yaml"
+        settings_file = self._settings_path
         
         if not settings_file.exists():
-            await self._create_default_settings()
+            # The defaults just written are what __init__ already set up
+            self._create_default_settings()
+            return
             
         try:
-            with open(settings_file, 'r', encoding='utf-8') as f:
-                settings = yaml.safe_load(f) or {}
+            settings = _load_yaml_cached(settings_file) or {}
             
             # Update configurations
             if 'sandbox' in settings:
@@ -171,79 +597,121 @@ class ConfigManager:
                 self.ui = UIConfig(**settings['ui'])
                 
             if 'custom' in settings:
-                self.custom_settings = settings['custom']
+                # tools.yaml sections are merged into it; an empty section is None
+                custom = settings['custom'] or {}
+                if not isinstance(custom, dict):
+                    raise ConfigurationError("Error loading settings.yaml: 'custom' must be a mapping")
+                self.custom_settings = custom
                 
-        except Exception as e:
-            raise ConfigurationError(f"Error loading settings.yaml: {e}")
+        except (OSError, yaml.YAMLError, TypeError, ValueError) as e:
+            raise ConfigurationError(f"Error loading settings.yaml: {e}") from e
     
-    async def _load_model_configs(self):
-        """Load model configurations"""
-        models_file = self.config_dir / "models.yaml"
-        
-        if not models_file.exists():
-            await self._create_default_models()
+    def _load_model_configs(self) -> Dict[str, ModelConfig]:
+        """Load and validate model configurations"""
+        models_file = self._models_path
         
         try:
-            with open(models_file, 'r', encoding='utf-8') as f:
-                models_data = yaml.safe_load(f) or {}
+            if models_file.exists():
+                models_data = _load_yaml_cached(models_file) or {}
+            else:
+                # Build from the defaults being written instead of re-reading them
+                models_data = self._create_default_models()
             
-            self.models = {}
+            env_api_key = os.environ.get(_API_KEY_ENV, '')
+            models = {}
             for model_name, model_data in models_data.get('models', {}).items():
-                self.models[model_name] = ModelConfig(
-                    name=model_name,
-                    **model_data
-                )
+                # save_config writes 'name' too; the mapping key wins
+                model_config = ModelConfig(**{**model_data, 'name': model_name})
+                if not model_config.api_key:
+                    model_config.api_key = env_api_key
+                model_config.capabilities = _intern_capabilities(model_config.capabilities)
+                models[model_name] = model_config
                 
-        except Exception as e:
-            raise ConfigurationError(f"Error loading models.yaml: {e}")
+        except (OSError, yaml.YAMLError, TypeError, ValueError, AttributeError) as e:
+            # AttributeError: a top-level or 'models' value that is not a mapping
+            raise ConfigurationError(f"Error loading models.yaml: {e}") from e
+        
+        if not models:
+            raise ConfigurationError("No models configured")
+        
+        for model_name, model_config in models.items():
+            if not model_config.api_key:
+                raise ConfigurationError(
+                    f"No API key for model: {model_name} (set it in models.yaml or {_API_KEY_ENV})"
+                )
+            if not model_config.base_url:
+                raise ConfigurationError(f"No base URL for model: {model_name}")
+        
+        return models
     
-    async def _load_tool_configs(self):
+    def _load_tool_configs(self):
         """Load tool configurations"""
-        tools_file = self.config_dir / "tools.yaml"
+        tools_file = self._tools_path
         
         if tools_file.exists():
             try:
-                with open(tools_file, 'r', encoding='utf-8') as f:
-                    tools_data = yaml.safe_load(f) or {}
-                    
-                # Update tool-specific settings
-                if 'code_quality' in tools_data:
-                    self.custom_settings['code_quality'] = tools_data['code_quality']
-                    
-                if 'browser' in tools_data:
-                    self.custom_settings['browser'] = tools_data['browser']
+                tools_data = _load_yaml_cached(tools_file) or {}
+                if not isinstance(tools_data, dict):
+                    raise ConfigurationError("top level must be a mapping")
+                
+                # Update tool-specific settings, rejecting malformed sections
+                # here rather than when a tool first reads them
+                for section in _TOOL_SECTIONS:
+                    if section not in tools_data:
+                        continue
+                    if not isinstance(tools_data[section], dict):
+                        self.logger.warning(f"Ignoring tools.yaml section '{section}': expected a mapping")
+                        continue
+                    self.custom_settings[section] = tools_data[section]
                     
-            except Exception as e:
+            except (OSError, yaml.YAMLError, ValueError, ConfigurationError) as e:
                 self.logger.warning(f"Could not load tools.yaml: {e}")
     
-    async def _load_security_policies(self):
-        """Load security policies"""
-        security_file = self.config_dir / "security_policies.yaml"
+    def _apply_security_policies(self):
+        """Apply security_policies.yaml to sections not patched yet"""
+        pending = self._policies_pending
+        if not pending:
+            return
+        # Cleared first so a failed load is not retried on every attribute access
+        self._policies_pending = set()
+        # Policy values are not user edits: they are not written back by
+        # save_config() unless the section is changed afterwards. A section
+        # already edited in place keeps its saved state, so the edit is saved.
+        unedited = [
+            attr for attr in pending
+            if self._section_state(attr) == self._saved_state.get(_SETTINGS_SECTIONS[attr])
+        ]
+        self._load_security_policies(pending)
+        for attr in unedited:
+            self._saved_state[_SETTINGS_SECTIONS[attr]] = self._section_state(attr)
+    
+    def _load_security_policies(self, sections: Set[str]):
+        """Load security policies into sections ('sandbox', 'security')"""
+        security_file = self._security_path
         
         if security_file.exists():
             try:
-                with open(security_file, 'r', encoding='utf-8') as f:
-                    security_data = yaml.safe_load(f) or {}
+                security_data = _load_yaml_cached(security_file) or {}
                 
                 # Update security settings
-                if 'policies' in security_data:
+                if 'security' in sections and 'policies' in security_data:
                     for key, value in security_data['policies'].items():
-                        if hasattr(self.security, key):
-                            setattr(self.security, key, value)
+                        if key in _SECURITY_FIELDS:
+                            setattr(self._security, key, value)
                             
                 # Update sandbox security
-                if 'sandbox_policies' in security_data:
+                if 'sandbox' in sections and 'sandbox_policies' in security_data:
                     policies = security_data['sandbox_policies']
                     if 'allowed_commands' in policies:
-                        self.sandbox.allowed_commands = policies['allowed_commands']
+                        self._sandbox.allowed_commands = policies['allowed_commands']
                     if 'blocked_commands' in policies:
-                        self.sandbox.blocked_commands = policies['blocked_commands']
+                        self._sandbox.blocked_commands = policies['blocked_commands']
                         
-            except Exception as e:
+            except (OSError, yaml.YAMLError, TypeError, ValueError, AttributeError) as e:
                 self.logger.warning(f"Could not load security_policies.yaml: {e}")
     
-    async def _create_default_settings(self):
-        """Create default settings.yaml"""
+    def _create_default_settings(self) -> Dict[str, Any]:
+        """Create default settings.yaml and return the written data"""
         default_settings = {
             'sandbox': asdict(SandboxConfig()),
             'database': asdict(DatabaseConfig()),
@@ -254,159 +722,158 @@ class ConfigManager:
             'custom': {}
         }
         
-        settings_file = self.config_dir / "settings.yaml"
-        with open(settings_file, 'w', encoding='utf-8') as f:
-            yaml.dump(default_settings, f, default_flow_style=False)
+        _dump_yaml(default_settings, self._settings_path)
+        return default_settings
     
-    async def _create_default_models(self):
-        """Create default models.yaml with provided model configurations"""
+    def _create_default_models(self) -> Dict[str, Any]:
+        """Create default models.yaml with provided model configurations
+        
+        Returns the written data.
+        """
         default_models = {
             'models': {
-                'devstral_small': {
-                    'base_url': 'https://openrouter.ai/api/v1',
-                    'api_key': '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',
-                    'model': 'mistralai/devstral-small:free',
-                    'details': 'Devstral-Small-2505 is a 24B parameter agentic LLM fine-tuned from Mistral-Small-3.1, jointly developed by Mistral AI and All Hands AI for advanced software engineering tasks.',
-                    'max_tokens': 128000,
-                    'temperature': 0.7,
-                    'capabilities': ['coding', 'agents', 'file_editing']
-                },
-                'llama_3_3_8b': {
-                    'base_url': 'https://openrouter.ai/api/v1',
-                    'api_key': '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',
-                    'model': 'meta-llama/llama-3.3-8b-instruct:free',
-                    'details': 'A lightweight and ultra-fast variant of Llama 3.3 70B, for use when quick response times are needed most.',
-                    'max_tokens': 128000,
-                    'temperature': 0.7,
-                    'capabilities': ['general', 'fast_response']
-                },
-                'phi_4_reasoning': {
-                    'base_url': 'https://openrouter.ai/api/v1',
-                    'api_key': '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',
-                    'model': 'microsoft/phi-4-reasoning-plus:free',
-                    'details': 'Phi-4-reasoning-plus is an enhanced 14B parameter model from Microsoft, fine-tuned with additional reinforcement learning to boost accuracy on math, science, and code reasoning tasks.',
-                    'max_tokens': 128000,
-                    'temperature': 0.3,
-                    'capabilities': ['reasoning', 'math', 'science', 'coding']
-                },
-                'deepseek_v3': {
-                    'base_url': 'https://openrouter.ai/api/v1',
-                    'api_key': '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',
-                    'model': 'deepseek/deepseek-chat-v3-0324:free',
-                    'details': 'DeepSeek V3, a 685B-parameter, mixture-of-experts model, is the latest iteration of the flagship chat model family.',
-                    'max_tokens': 163840,
-                    'temperature': 0.7,
-                    'capabilities': ['general', 'conversation', 'large_context']
-                },
-                'qwen3_30b': {
-                    'base_url': 'https://openrouter.ai/api/v1',
-                    'api_key': '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',
-                    'model': 'qwen/qwen3-30b-a3b:free',
-                    'details': 'Qwen3 features both dense and mixture-of-experts (MoE) architectures to excel in reasoning, multilingual support, and advanced agent tasks.',
-                    'max_tokens': 131072,
-                    'temperature': 0.7,
-                    'capabilities': ['reasoning', 'multilingual', 'agents', 'creative_writing']
-                }
+                name: {**spec, 'api_key': '', 'capabilities': list(spec['capabilities'])}
+                for name, spec in _DEFAULT_MODELS.items()
             }
         }
         
-        models_file = self.config_dir / "models.yaml"
-        with open(models_file, 'w', encoding='utf-8') as f:
-            yaml.dump(default_models, f, default_flow_style=False)
+        _dump_yaml(default_models, self._models_path)
+        return default_models
     
-    async def _validate_config(self):
+    def _validate_config(self):
         """Validate configuration settings"""
-        try:
-            # Validate models
-            if not self.models:
-                raise ConfigurationError("No models configured")
-            
-            for model_name, model_config in self.models.items():
-                if not model_config.api_key:
-                    raise ConfigurationError(f"No API key for model: {model_name}")
-                if not model_config.base_url:
-                    raise ConfigurationError(f"No base URL for model: {model_name}")
-            
-            # Validate directories
-            for dir_path in [self.sandbox.workspace_dir, self.database.path, 
-                           self.memory.chromadb_path, self.logging.log_dir]:
-                try:
-                    Path(dir_path).parent.mkdir(parents=True, exist_ok=True)
-                except Exception as e:
-                    raise ConfigurationError(f"Cannot create directory {dir_path}: {e}")
-            
-            # Validate resource limits
-            if self.sandbox.max_file_size_mb <= 0:
-                raise ConfigurationError("Invalid sandbox file size limit")
-            
-            if self.sandbox.max_execution_time <= 0:
-                raise ConfigurationError("Invalid sandbox execution time limit")
-            
-            self.logger.info("Configuration validation successful")
-            
-        except Exception as e:
-            raise ConfigurationError(f"Configuration validation failed: {e}")
+        # Models are validated when they are loaded. The sandbox fields
+        # checked here are not touched by security policies, so read the
+        # backing attribute and leave the policy file unread.
+        
+        # Validate directories
+        # Several paths usually share a parent (e.g. ./data): create each once
+        parents: Dict[Path, str] = {}
+        for dir_path in [self._sandbox.workspace_dir, self.database.path, 
+                       self.memory.chromadb_path, self.logging.log_dir]:
+            parents.setdefault(Path(dir_path).parent, dir_path)
+        
+        for parent in sorted(parents, key=lambda p: len(p.parts)):
+            try:
+                parent.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                raise ConfigurationError(f"Cannot create directory {parents[parent]}: {e}") from e
+        
+        # Validate resource limits
+        if self._sandbox.max_file_size_mb <= 0:
+            raise ConfigurationError("Invalid sandbox file size limit")
+        
+        if self._sandbox.max_execution_time <= 0:
+            raise ConfigurationError("Invalid sandbox execution time limit")
+        
+        self.logger.info("Configuration validation successful")
     
     def get_model_config(self, model_name: str) -> Optional[ModelConfig]:
         """Get specific model configuration"""
         return self.models.get(model_name)
     
     def get_enabled_models(self) -> Dict[str, ModelConfig]:
-        """Get all enabled models"""
-        return {name: config for name, config in self.models.items() if config.enabled}
-    
-    def get_best_model_for_task(self, task_type: str) -> Optional[ModelConfig]:
-        """Get best model for specific task type"""
-        task_model_mapping = {
-            'coding': ['devstral_small', 'phi_4_reasoning'],
-            'reasoning': ['phi_4_reasoning', 'qwen3_30b'],
-            'general': ['deepseek_v3', 'llama_3_3_8b'],
-            'fast': ['llama_3_3_8b'],
-            'agents': ['devstral_small', 'qwen3_30b'],
-            'multilingual': ['qwen3_30b', 'deepseek_v3']
-        }
+        """Get all enabled models
         
-        preferred_models = task_model_mapping.get(task_type, list(self.models.keys()))
+        The dict is cached and shared between calls; do not modify it. It is
+        refreshed after update_model_config() or invalidate_models().
+        """
+        if self._enabled_cache is None:
+            self._enabled_cache = {name: config for name, config in self.models.items() if config.enabled}
+        return self._enabled_cache
+    
+    def iter_enabled_models(self) -> Iterator[ModelConfig]:
+        """Iterate over enabled models without building a dict"""
+        return (config for config in self.models.values() if config.enabled)
+    
+    def get_best_model_for_task(self, task_type: str,
+                                capabilities: Optional[Iterable[str]] = None) -> Optional[ModelConfig]:
+        """Get best model for specific task type
         
-        for model_name in preferred_models:
-            if model_name in self.models and self.models[model_name].enabled:
-                return self.models[model_name]
+        With capabilities given, return the first enabled model having at
+        least one of them instead of consulting the task preference table.
+        """
+        required = frozenset(capabilities) if capabilities is not None else None
+        cache_key = task_type if required is None else (task_type, required)
+        try:
+            return self._best_model_cache[cache_key]
+        except KeyError:
+            pass
         
-        # Fallback to first enabled model
-        enabled_models = self.get_enabled_models()
-        return next(iter(enabled_models.values())) if enabled_models else None
+        best = None
+        if required is not None:
+            for model_config in self.iter_enabled_models():
+                if not model_config.capabilities.isdisjoint(required):
+                    best = model_config
+                    break
+        else:
+            models = self.models
+            for model_name in _TASK_MODEL_PREFS.get(task_type, models):
+                model_config = models.get(model_name)
+                if model_config is not None and model_config.enabled:
+                    best = model_config
+                    break
+            else:
+                # Fallback to first enabled model
+                best = next(self.iter_enabled_models(), None)
+        
+        self._best_model_cache[cache_key] = best
+        return best
     
-    async def save_config(self):
-        """Save current configuration to files"""
+    async def save_config(self, force: bool = False):
+        """Save changed configuration sections to files
+        
+        With force=True every section is written, changed or not.
+        """
         try:
-            # Save main settings
-            settings_data = {
-                'sandbox': asdict(self.sandbox),
-                'database': asdict(self.database),
-                'memory': asdict(self.memory),
-                'logging': asdict(self.logging),
-                'security': asdict(self.security),
-                'ui': asdict(self.ui),
-                'custom': self.custom_settings
-            }
+            dirty = self._dirty
+            settings_exists = self._settings_path.exists()
             
-            settings_file = self.config_dir / "settings.yaml"
-            with open(settings_file, 'w', encoding='utf-8') as f:
-                yaml.dump(settings_data, f, default_flow_style=False)
+            # Save main settings: serialize changed sections, keep the rest as on disk
+            saved_state = self._saved_state
+            if force or not settings_exists:
+                settings_dirty = set(_SETTINGS_SECTIONS.values())
+            else:
+                settings_dirty = {
+                    section for attr, section in _SETTINGS_SECTIONS.items()
+                    if section in dirty or self._section_state(attr) != saved_state.get(section)
+                }
             
-            # Save models
-            models_data = {
-                'models': {name: asdict(config) for name, config in self.models.items()}
-            }
+            if settings_dirty:
+                settings_data = (_load_yaml_cached(self._settings_path) or {}) if settings_exists else {}
+                for attr, section in _SETTINGS_SECTIONS.items():
+                    if section not in settings_dirty:
+                        continue
+                    value = getattr(self, attr)
+                    settings_data[section] = value if section == 'custom' else asdict(value)
+                
+                _dump_yaml(settings_data, self._settings_path)
             
-            models_file = self.config_dir / "models.yaml"
-            with open(models_file, 'w', encoding='utf-8') as f:
-                yaml.dump(models_data, f, default_flow_style=False)
+            # Save models (only if they were loaded; otherwise the file is current)
+            models_state = self._models_state(self.__dict__['models']) if 'models' in self.__dict__ else None
+            if models_state is not None and (
+                force or 'models' in dirty or models_state != saved_state.get('models')
+                or not self._models_path.exists()
+            ):
+                # A key taken from the environment is not written back to disk
+                env_api_key = os.environ.get(_API_KEY_ENV)
+                models_data = {'models': {}}
+                for name, config in self.models.items():
+                    model_dict = _model_to_dict(config)
+                    if env_api_key and model_dict['api_key'] == env_api_key:
+                        model_dict['api_key'] = ''
+                    models_data['models'][name] = model_dict
+                
+                _dump_yaml(models_data, self._models_path)
             
+            dirty.clear()
+            self._remember_saved_state()
+            if models_state is not None:
+                saved_state['models'] = models_state
             self.logger.info("Configuration saved successfully")
             
-        except Exception as e:
-            raise ConfigurationError(f"Failed to save configuration: {e}")
+        except (OSError, yaml.YAMLError, TypeError) as e:
+            raise ConfigurationError(f"Failed to save configuration: {e}") from e
     
     def update_model_config(self, model_name: str, **kwargs):
         """Update model configuration"""
@@ -414,8 +881,13 @@ class ConfigManager:
             raise ConfigurationError(f"Model {model_name} not found")
         
         model_config = self.models[model_name]
+        # Enabling/disabling a model changes the derived model lookups
+        self.invalidate_model_caches()
+        self._dirty.add('models')
         for key, value in kwargs.items():
-            if hasattr(model_config, key):
+            if key in _MODEL_FIELDS:
+                if key == 'capabilities':
+                    value = _intern_capabilities(value)
                 setattr(model_config, key, value)
             else:
                 raise ConfigurationError(f"Invalid model config key: {key}")
@@ -427,44 +899,78 @@ class ConfigManager:
     def set_setting(self, key: str, value: Any):
         """Set custom setting value"""
         self.custom_settings[key] = value
+        self._dirty.add('custom')
     
     def export_config(self) -> Dict[str, Any]:
         """Export complete configuration as dictionary"""
         return {
-            'models': {name: asdict(config) for name, config in self.models.items()},
+            'models': {name: _model_to_dict(config) for name, config in self.models.items()},
             'sandbox': asdict(self.sandbox),
             'database': asdict(self.database),
             'memory': asdict(self.memory),
             'logging': asdict(self.logging),
             'security': asdict(self.security),
             'ui': asdict(self.ui),
-            'custom': deepcopy(self.custom_settings)
+            'custom': _clone_plain(self.custom_settings)
         }
     
+    async def check_model(self, model_name: str, session=None) -> bool:
+        """Check connectivity to a single configured model
+        
+        Pass an open aiohttp session to reuse its connection pool; otherwise a
+        session is created for this one probe.
+        """
+        model_config = self.models[model_name]
+        if not model_config.enabled:
+            return False
+            
+        try:
+            # Simple connectivity check - could be expanded
+            import aiohttp
+            
+            if session is None:
+                async with aiohttp.ClientSession() as own_session:
+                    return await self._probe_model(own_session, model_config)
+            return await self._probe_model(session, model_config)
+                    
+        except Exception as e:
+            self.logger.warning(f"Connectivity check failed for {model_name}: {e}")
+            return False
+    
+    async def _probe_model(self, session, model_config: ModelConfig) -> bool:
+        """GET <base_url>/models and report whether it answered 200"""
+        import aiohttp
+        
+        headers = {'Authorization': f'Bearer {model_config.api_key}'}
+        async with session.get(
+            f"{model_config.base_url}/models", 
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            return response.status == 200
+    
     async def check_model_connectivity(self) -> Dict[str, bool]:
-        """Check connectivity to all configured models"""
-        results = {}
+        """Check connectivity to all configured models concurrently"""
+        results = {name: False for name in self.models}
+        enabled = [name for name, config in self.models.items() if config.enabled]
+        if not enabled:
+            return results
         
-        for model_name, model_config in self.models.items():
-            if not model_config.enabled:
-                results[model_name] = False
-                continue
-                
-            try:
-                # Simple connectivity check - could be expanded
-                import aiohttp
-                
-                async with aiohttp.ClientSession() as session:
-                    headers = {'Authorization': f'Bearer {model_config.api_key}'}
-                    async with session.get(
-                        f"{model_config.base_url}/models", 
-                        headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=10)
-                    ) as response:
-                        results[model_name] = response.status == 200
-                        
-            except Exception as e:
-                self.logger.warning(f"Connectivity check failed for {model_name}: {e}")
-                results[model_name] = False
+        # aiohttp is optional at import time; only connectivity checks need it
+        try:
+            import aiohttp
+        except ImportError as e:
+            self.logger.warning(f"Connectivity check unavailable: {e}")
+            return results
+        
+        # One session for every probe: models sharing a host reuse connections
+        connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            probes = await asyncio.gather(
+                *(self.check_model(name, session) for name in enabled),
+                return_exceptions=True
+            )
         
-        return results
\ No newline at end of file
+        for name, connected in zip(enabled, probes):
+            results[name] = connected is True
+        return results
@@ -7,95 +7,163 @@ import sys
 import os
 import asyncio
 import signal
-import traceback
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncContextManager, Protocol, TYPE_CHECKING, runtime_checkable
 
-# Add project root to Python path
-PROJECT_ROOT = Path(__file__).parent.absolute()
-sys.path.insert(0, str(PROJECT_ROOT))
+# Resolved once, following a symlinked main.py to the real checkout
+PROJECT_ROOT = Path(__file__).resolve().parent
 
-try:
+# Socket a daemon started with --daemon listens on
+DAEMON_SOCKET = PROJECT_ROOT / "data" / "ai-assistant.sock"
+
+# The application stack is imported where it is first needed, so that the
+# version check and simple invocations do not pay for loading all of it
+if TYPE_CHECKING:
     from core.cli import CLIHandler
     from core.assistant import AIAssistant
     from core.config import ConfigManager
-    from core.exceptions import (
-        AIAssistantError, 
-        ConfigurationError, 
-        ModelError,
-        TaskPlanningError,
-        SandboxError
-    )
-    from ui.logger import setup_logger
-    from ui.formatter import ColorFormatter
     from database.database import DatabaseManager
-    from utils.system_utils import SystemChecker
-except ImportError as e:
-    print(f"❌ Import Error: {e}")
+
+@runtime_checkable
+class SupportsClientContext(Protocol):
+    """An assistant that can share its network and database clients
+    
+    client_context() returns an async context manager. While it is entered,
+    process_batch_request() reuses one HTTP session and one set of database
+    connections for every input file instead of opening them per file; on
+    exit they are closed. run_batch_mode() enters it when the assistant
+    implements this protocol.
+    """
+    
+    def client_context(self) -> AsyncContextManager[Any]:
+        ...
+
+def _import_error_exit(*errors: ImportError):
+    """Report missing dependencies and exit"""
+    for e in errors:
+        print(f"❌ Import Error: {e}")
     print("Please ensure all dependencies are installed: pip install -r requirements.txt")
     sys.exit(1)
 
+def _import_all(*names: str, check: tuple = ()) -> list:
+    """Import "module:attribute" names, reporting every failure at once
+    
+    Modules of the names in check are only located, not imported, so
+    they are reported along with the rest without paying for the import.
+    """
+    import importlib
+    import importlib.util
+    
+    found, missing = [], []
+    for name in names:
+        module_name, attr = name.split(':')
+        try:
+            found.append(getattr(importlib.import_module(module_name), attr))
+        except ImportError as e:
+            missing.append(e)
+        except AttributeError:
+            missing.append(ImportError(f"cannot import name '{attr}' from '{module_name}'"))
+    for name in check:
+        module_name = name.split(':')[0]
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except ImportError as e:
+            # A missing parent package
+            missing.append(e)
+            continue
+        if spec is None:
+            missing.append(ModuleNotFoundError(f"No module named '{module_name}'"))
+    if missing:
+        _import_error_exit(*missing)
+    return found
+
+# Imported by initialize_full(); initialize_minimal() checks they exist
+_FULL_IMPORTS = ('core.assistant:AIAssistant', 'database.database:DatabaseManager')
+
+_EXIT_COMMANDS = frozenset(('exit', 'quit', 'q'))
+_HELP_COMMANDS = frozenset(('help', '?'))
+
+# Seconds cleanup() waits for the assistant and database to close
+_CLEANUP_TIMEOUT = 5.0
+
 class AIAssistantMain:
     """Main application class for AI Assistant CLI"""
     
+    __slots__ = (
+        "config_manager", "assistant", "cli_handler", "db_manager",
+        "logger", "shutdown_requested", "shutdown_event",
+    )
+    
     def __init__(self):
-        self.config_manager: Optional[ConfigManager] = None
-        self.assistant: Optional[AIAssistant] = None
-        self.cli_handler: Optional[CLIHandler] = None
-        self.db_manager: Optional[DatabaseManager] = None
+        self.config_manager: Optional["ConfigManager"] = None
+        self.assistant: Optional["AIAssistant"] = None
+        self.cli_handler: Optional["CLIHandler"] = None
+        self.db_manager: Optional["DatabaseManager"] = None
         self.logger = None
         self.shutdown_requested = False
+        # Set with shutdown_requested; created by setup_signal_handlers() on the running loop
+        self.shutdown_event: Optional[asyncio.Event] = None
         
+    # Handlers are registered once per event loop and notify the most recent
+    # instance to call setup_signal_handlers()
+    _signal_target: Optional["AIAssistantMain"] = None
+    _signals_loop: Optional[asyncio.AbstractEventLoop] = None
+    
     def setup_signal_handlers(self):
         """Setup graceful shutdown signal handlers"""
-        def signal_handler(signum, frame):
-            self.logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-            self.shutdown_requested = True
-            
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        cls = type(self)
+        cls._signal_target = self
+        self.shutdown_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        if cls._signals_loop is loop:
+            return
+        cls._signals_loop = loop
+        
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                # Runs as a loop callback instead of between arbitrary bytecodes
+                loop.add_signal_handler(signum, cls._on_signal, signum)
+            except NotImplementedError:
+                # Windows event loops do not support add_signal_handler; hand
+                # the signal to the loop so the shutdown event can be set
+                signal.signal(signum, lambda sig, frame: loop.call_soon_threadsafe(cls._on_signal, sig))
+    
+    @classmethod
+    def _on_signal(cls, signum: int):
+        """Ask the current instance to shut down"""
+        app = cls._signal_target
+        if app is None:
+            return
+        if app.logger:
+            app.logger.info(f"Received signal {signum}, initiating graceful shutdown...")
+        app.shutdown_requested = True
+        if app.shutdown_event is not None:
+            app.shutdown_event.set()
         
     async def initialize(self) -> bool:
         """Initialize all components with error handling"""
+        return await self.initialize_minimal() and await self.initialize_full()
+    
+    async def initialize_minimal(self) -> bool:
+        """Set up logging, configuration and the CLI handler
+        
+        This is all --config-check needs; initialize_full() adds the rest.
+        """
+        return await self._guarded_init(self._setup_minimal)
+    
+    async def initialize_full(self) -> bool:
+        """Set up the database and the assistant after initialize_minimal()"""
+        return await self._guarded_init(self._setup_full)
+    
+    async def _guarded_init(self, setup) -> bool:
+        """Run an initialization step, reporting its errors"""
+        ConfigurationError, ModelError = _import_all(
+            'core.exceptions:ConfigurationError',
+            'core.exceptions:ModelError',
+        )
+        
         try:
-            # Setup logging first
-            self.logger = setup_logger("ai_assistant", PROJECT_ROOT / "data" / "logs")
-            self.logger.info("🚀 Initializing AI Assistant CLI...")
-            
-            # Check system requirements
-            system_checker = SystemChecker()
-            if not system_checker.check_system_compatibility():
-                self.logger.error("❌ System compatibility check failed")
-                return False
-                
-            # Initialize configuration
-            self.config_manager = ConfigManager(PROJECT_ROOT / "config")
-            await self.config_manager.load_config()
-            self.logger.info("✅ Configuration loaded successfully")
-            
-            # Initialize database
-            self.db_manager = DatabaseManager(PROJECT_ROOT / "data" / "database.sqlite")
-            await self.db_manager.initialize()
-            self.logger.info("✅ Database initialized successfully")
-            
-            # Initialize core assistant
-            self.assistant = AIAssistant(
-                config_manager=self.config_manager,
-                db_manager=self.db_manager,
-                logger=self.logger
-            )
-            await self.assistant.initialize()
-            self.logger.info("✅ AI Assistant core initialized successfully")
-            
-            # Initialize CLI handler
-            self.cli_handler = CLIHandler(
-                assistant=self.assistant,
-                config_manager=self.config_manager,
-                logger=self.logger
-            )
-            self.logger.info("✅ CLI Handler initialized successfully")
-            
-            return True
+            return await setup()
             
         except ConfigurationError as e:
             self.logger.error(f"❌ Configuration Error: {e}")
@@ -108,44 +176,133 @@ class AIAssistantMain:
             return False
             
         except Exception as e:
-            self.logger.error(f"❌ Initialization Error: {e}")
-            self.logger.error(traceback.format_exc())
+            # exception() formats the traceback only if a handler emits it
+            self.logger.exception(f"❌ Initialization Error: {e}")
             print(f"Initialization Error: {e}")
             return False
     
+    async def _setup_minimal(self) -> bool:
+        CLIHandler, ConfigCache, ConfigManager, setup_logger, SystemChecker = _import_all(
+            'core.cli:CLIHandler',
+            'core.config:ConfigCache',
+            'core.config:ConfigManager',
+            'ui.logger:setup_logger',
+            'utils.system_utils:SystemChecker',
+            check=_FULL_IMPORTS,
+        )
+        
+        # Setup logging first
+        self.logger = setup_logger("ai_assistant", PROJECT_ROOT / "data" / "logs")
+        self.logger.info("🚀 Initializing AI Assistant CLI...")
+        
+        # The system check and configuration do not depend on each other, so
+        # run them concurrently (the check is synchronous)
+        self.config_manager = ConfigManager(PROJECT_ROOT / "config")
+        system_ok, config_result = await asyncio.gather(
+            asyncio.to_thread(SystemChecker().check_system_compatibility),
+            ConfigCache(PROJECT_ROOT / "data" / "cache").load(self.config_manager),
+            return_exceptions=True
+        )
+        
+        # Report failures in the order the steps used to run
+        if isinstance(system_ok, BaseException):
+            raise system_ok
+        if not system_ok:
+            self.logger.error("❌ System compatibility check failed")
+            return False
+            
+        if isinstance(config_result, BaseException):
+            raise config_result
+        self.logger.info("✅ Configuration loaded successfully")
+        
+        # Initialize CLI handler; the assistant is attached by _setup_full()
+        self.cli_handler = CLIHandler(
+            assistant=None,
+            config_manager=self.config_manager,
+            logger=self.logger
+        )
+        self.logger.info("✅ CLI Handler initialized successfully")
+        
+        return True
+    
+    async def _setup_full(self) -> bool:
+        AIAssistant, DatabaseManager = _import_all(*_FULL_IMPORTS)
+        
+        # Initialize database
+        self.db_manager = DatabaseManager(PROJECT_ROOT / "data" / "database.sqlite")
+        await self.db_manager.initialize()
+        self.logger.info("✅ Database initialized successfully")
+        
+        # Initialize core assistant
+        self.assistant = AIAssistant(
+            config_manager=self.config_manager,
+            db_manager=self.db_manager,
+            logger=self.logger
+        )
+        await self.assistant.initialize()
+        self.cli_handler.assistant = self.assistant
+        self.logger.info("✅ AI Assistant core initialized successfully")
+        
+        return True
+    
     async def run_interactive_mode(self):
         """Run assistant in interactive mode"""
+        try:
+            # Plain text under --no-color or when stdout is not a terminal
+            formatter = self.cli_handler.formatter
+        except ImportError as e:
+            _import_error_exit(e)
+        
+        # A signal ends the session even while input() is blocked
+        shutdown = None
+        if self.shutdown_event is not None:
+            shutdown = asyncio.ensure_future(self.shutdown_event.wait())
+        
         try:
             self.logger.info("🎯 Starting interactive mode...")
-            formatter = ColorFormatter()
             
-            print(formatter.format_header("🤖 AI Assistant CLI - Interactive Mode"))
-            print(formatter.format_info("Type 'help' for commands, 'exit' to quit"))
-            print("-" * 60)
+            sys.stdout.write("".join([
+                formatter.format_header("🤖 AI Assistant CLI - Interactive Mode"), "\n",
+                formatter.format_info("Type 'help' for commands, 'exit' to quit"), "\n",
+                "-" * 60, "\n"
+            ]))
             
             while not self.shutdown_requested:
                 try:
-                    user_input = input("\n💬 Enter your request: ").strip()
+                    line = _read_line("\n💬 Enter your request: ")
+                    if shutdown is None:
+                        await line
+                    else:
+                        await asyncio.wait((line, shutdown), return_when=asyncio.FIRST_COMPLETED)
+                    if self.shutdown_requested:
+                        # Whatever the reader thread gets later is dropped
+                        line.cancel()
+                        break
+                    user_input = line.result().strip()
                     
                     if not user_input:
                         continue
                         
-                    if user_input.lower() in ['exit', 'quit', 'q']:
+                    command = user_input.lower()
+                    if command in _EXIT_COMMANDS:
                         break
                         
-                    if user_input.lower() in ['help', '?']:
+                    if command in _HELP_COMMANDS:
                         await self.cli_handler.show_help()
                         continue
                     
                     # Process user request
                     result = await self.assistant.process_request(user_input)
                     
+                    # Build the whole report and write it in one go
                     if result.get('success'):
-                        print(formatter.format_success("✅ Task completed successfully"))
+                        parts = [formatter.format_success("✅ Task completed successfully"), "\n"]
                         if result.get('output'):
-                            print(formatter.format_output(result['output']))
+                            parts += [formatter.format_output(result['output']), "\n"]
                     else:
-                        print(formatter.format_error(f"❌ Task failed: {result.get('error', 'Unknown error')}"))
+                        parts = [formatter.format_error(f"❌ Task failed: {result.get('error', 'Unknown error')}"), "\n"]
+                    sys.stdout.write("".join(parts))
+                    sys.stdout.flush()
                         
                 except KeyboardInterrupt:
                     print("\n\nShutdown requested by user...")
@@ -158,28 +315,38 @@ class AIAssistantMain:
         except Exception as e:
             self.logger.error(f"❌ Interactive mode error: {e}")
             raise
+        finally:
+            if shutdown is not None:
+                shutdown.cancel()
     
     async def run_batch_mode(self, args: Dict[str, Any]):
         """Run assistant in batch mode with provided arguments"""
+        import contextlib
+        from core.cli import BatchArgs
+        from core.exceptions import AIAssistantError
+        
         try:
             self.logger.info("📋 Starting batch mode...")
             
             # Extract arguments
-            input_files = args.get('input_files', [])
-            prompt = args.get('prompt', '')
-            output_dir = args.get('output_dir', './output')
-            model = args.get('model', 'auto')
+            batch = BatchArgs.from_args(args)
             
-            if not prompt and not input_files:
+            if not batch.prompt and not batch.input_files:
                 raise AIAssistantError("Either prompt or input files must be provided")
             
-            # Process batch request
-            result = await self.assistant.process_batch_request(
-                input_files=input_files,
-                prompt=prompt,
-                output_dir=output_dir,
-                model=model
-            )
+            # Process batch request, sharing clients across all input files
+            # when the assistant supports it (see SupportsClientContext)
+            if isinstance(self.assistant, SupportsClientContext):
+                clients = self.assistant.client_context()
+            else:
+                clients = contextlib.nullcontext()
+            async with clients:
+                result = await self.assistant.process_batch_request(
+                    input_files=batch.input_files,
+                    prompt=batch.prompt,
+                    output_dir=batch.output_dir,
+                    model=batch.model
+                )
             
             if result.get('success'):
                 self.logger.info("✅ Batch processing completed successfully")
@@ -198,24 +365,238 @@ class AIAssistantMain:
             print(f"❌ Batch mode error: {e}")
             return 1
     
-    async def cleanup(self):
-        """Cleanup resources gracefully"""
+    @staticmethod
+    def is_interactive(args: Dict[str, Any]) -> bool:
+        """Whether the parsed arguments select interactive mode"""
+        return args.get('interactive', False) or not any([
+            args.get('prompt'),
+            args.get('input_files'),
+            args.get('config_check')
+        ])
+    
+    async def run_mode(self, args: Dict[str, Any]) -> int:
+        """Run the mode selected by the parsed arguments and return the exit code"""
+        if self.is_interactive(args):
+            # Interactive mode
+            await self.run_interactive_mode()
+            return 0
+        
+        if args.get('config_check'):
+            # Configuration check mode
+            success = await self.cli_handler.check_configuration()
+            return 0 if success else 1
+        
+        # Batch mode
+        return await self.run_batch_mode(args)
+    
+    async def run_daemon(self):
+        """Serve requests forwarded by other invocations over a Unix socket
+        
+        Requests run one at a time: each one changes the working directory
+        and captures stdout, stderr and logged warnings for the duration of
+        the command. The configuration is reloaded when its files change.
+        """
+        from core.exceptions import AIAssistantError
+        
+        if not hasattr(asyncio, 'start_unix_server'):
+            raise AIAssistantError("Daemon mode requires Unix domain sockets")
+        
+        if _daemon_listening():
+            raise AIAssistantError(f"A daemon is already listening on {DAEMON_SOCKET}")
+        # Nothing answers: a leftover socket from a daemon that did not shut down cleanly
+        DAEMON_SOCKET.unlink(missing_ok=True)
+        
+        lock = asyncio.Lock()
+        # Version of the config files the loaded settings came from
+        state = {'config_version': await asyncio.to_thread(self.config_manager.config_version)}
+        
+        async def handle_client(reader, writer):
+            await self._serve_daemon_client(reader, writer, lock, state)
+        
+        # Only the owner may connect: the socket is created with mode 0600
+        old_umask = os.umask(0o177)
         try:
-            self.logger.info("🧹 Starting cleanup...")
+            server = await asyncio.start_unix_server(
+                handle_client, path=str(DAEMON_SOCKET), limit=_DAEMON_REQUEST_LIMIT
+            )
+        finally:
+            os.umask(old_umask)
+        socket_inode = os.stat(DAEMON_SOCKET).st_ino
+        
+        self.logger.info(f"🛰️ Daemon listening on {DAEMON_SOCKET}")
+        try:
+            async with server:
+                while not self.shutdown_requested:
+                    await asyncio.sleep(0.5)
+        finally:
+            # Leave the path alone if another daemon has replaced the socket
+            try:
+                if os.stat(DAEMON_SOCKET).st_ino == socket_inode:
+                    DAEMON_SOCKET.unlink()
+            except FileNotFoundError:
+                pass
+            self.logger.info("Daemon stopped")
+    
+    async def _serve_daemon_client(self, reader, writer, lock: asyncio.Lock, state: Dict[str, Any]):
+        """Run one forwarded command and send back its output and exit code"""
+        import contextlib
+        import io
+        import logging
+        
+        json_dumps, json_loads = _json_codec()
+        try:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Longer than _DAEMON_REQUEST_LIMIT: nothing ran, so the client runs it
+                writer.write(json_dumps({'exit_code': None}) + b'\n')
+                await writer.drain()
+                return
+            if not line:
+                # A liveness probe (see _daemon_listening) sends nothing
+                return
+            try:
+                request = json_loads(line)
+                argv = [str(arg) for arg in request['argv']]
+                cwd = request['cwd']
+            except (ValueError, KeyError, TypeError) as e:
+                self.logger.warning(f"Ignoring malformed daemon request: {e}")
+                return
             
-            if self.assistant:
-                await self.assistant.cleanup()
-                
-            if self.db_manager:
-                await self.db_manager.close()
+            async with lock:
+                if not await self._reload_changed_config(state):
+                    # The client reports the configuration error itself
+                    writer.write(json_dumps({'exit_code': None}) + b'\n')
+                    await writer.drain()
+                    return
                 
-            self.logger.info("✅ Cleanup completed successfully")
+                output = io.StringIO()
+                errors = io.StringIO()
+                # Warnings about the command (e.g. a missing input file) go to
+                # the client too; handlers already attached keep their streams
+                log_handler = logging.StreamHandler(errors)
+                log_handler.setLevel(logging.WARNING)
+                self.logger.addHandler(log_handler)
+                previous_cwd = os.getcwd()
+                with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+                    try:
+                        os.chdir(cwd)
+                        exit_code = await self._run_forwarded(argv)
+                    except OSError as e:
+                        print(f"❌ Cannot use working directory {cwd}: {e}")
+                        exit_code = 1
+                    finally:
+                        os.chdir(previous_cwd)
+                        self.logger.removeHandler(log_handler)
             
+            reply = {'output': output.getvalue(), 'errors': errors.getvalue(), 'exit_code': exit_code}
+            writer.write(json_dumps(reply) + b'\n')
+            await writer.drain()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+    
+    async def _reload_changed_config(self, state: Dict[str, Any]) -> bool:
+        """Reload the configuration if its files changed since it was loaded
+        
+        Reloads in place, so the CLI handler and assistant see the new
+        settings. Returns False if the changed files cannot be loaded.
+        """
+        from core.config import ConfigCache
+        from core.exceptions import ConfigurationError
+        
+        version = await asyncio.to_thread(self.config_manager.config_version)
+        if version == state['config_version']:
+            return True
+        try:
+            await ConfigCache(PROJECT_ROOT / "data" / "cache").load(self.config_manager)
+        except ConfigurationError as e:
+            self.logger.warning(f"Could not reload configuration: {e}")
+            # The settings are partly reloaded: retry on the next request
+            state['config_version'] = None
+            return False
+        state['config_version'] = version
+        self.logger.info("🔄 Configuration reloaded")
+        return True
+    
+    async def _run_forwarded(self, argv) -> Optional[int]:
+        """Run a forwarded command line; None means the client must run it itself"""
+        from core.exceptions import AIAssistantError, TaskPlanningError, SandboxError
+        
+        # Decide from the parsed options, so abbreviations such as --std count
+        # too, before parse_arguments gets a chance to read stdin
+        try:
+            options, _ = self.cli_handler.parser.parse_known_args(argv)
+        except SystemExit as e:
+            # --help and --version print and exit; argparse has reported anything else
+            if e.code in (0, None):
+                return 0
+            print("❌ AI Assistant Error: Invalid command line arguments")
+            return 1
+        # Stdin and interactive sessions belong to the client's terminal
+        if not argv or options.stdin or options.interactive or options.daemon:
+            return None
+        
+        try:
+            args = self.cli_handler.parse_arguments(argv)
+        except SystemExit as e:
+            # --help and --version print and exit
+            return e.code if isinstance(e.code, int) else 0
+        except AIAssistantError as e:
+            print(f"❌ AI Assistant Error: {e}")
+            return 1
+        
+        if self.is_interactive(args):
+            return None
+        
+        try:
+            return await self.run_mode(args)
+        except (AIAssistantError, TaskPlanningError, SandboxError) as e:
+            print(f"❌ Error: {e}")
+            return 1
         except Exception as e:
+            self.logger.error(f"Unexpected error in forwarded command: {e}")
+            print(f"❌ Unexpected Error: {e}")
+            return 1
+    
+    async def cleanup(self):
+        """Cleanup resources gracefully"""
+        if self.logger is None:
+            # initialize() stopped before anything was set up
+            return
+        
+        self.logger.info("🧹 Starting cleanup...")
+        
+        # The teardowns are independent: run them together, and bound the
+        # total so a hung resource cannot hold up process exit
+        teardowns = []
+        if self.assistant:
+            teardowns.append(self.assistant.cleanup())
+        if self.db_manager:
+            teardowns.append(self.db_manager.close())
+        
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(*teardowns, return_exceptions=True),
+                timeout=_CLEANUP_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning(f"⚠️ Cleanup timed out after {_CLEANUP_TIMEOUT:g}s")
+            return
+        
+        errors = [r for r in results if isinstance(r, BaseException)]
+        for e in errors:
             self.logger.error(f"❌ Cleanup error: {e}")
+        if not errors:
+            self.logger.info("✅ Cleanup completed successfully")
 
 async def main():
     """Main entry point"""
+    try:
+        from core.exceptions import AIAssistantError, TaskPlanningError, SandboxError
+    except ImportError as e:
+        _import_error_exit(e)
+    
     app = None
     exit_code = 0
     
@@ -226,29 +607,28 @@ async def main():
         # Setup signal handlers for graceful shutdown
         app.setup_signal_handlers()
         
-        # Initialize application
-        if not await app.initialize():
+        # Configuration and the CLI handler are enough to parse arguments
+        if not await app.initialize_minimal():
             print("❌ Failed to initialize AI Assistant")
             return 1
         
         # Parse command line arguments
         args = app.cli_handler.parse_arguments()
         
-        # Determine execution mode
-        if args.get('interactive', False) or not any([
-            args.get('prompt'),
-            args.get('input_files'),
-            args.get('config_check')
-        ]):
-            # Interactive mode
-            await app.run_interactive_mode()
-        elif args.get('config_check'):
-            # Configuration check mode
+        if not args.get('daemon') and not app.is_interactive(args) and args.get('config_check'):
+            # A configuration check needs neither the database nor the assistant
             success = await app.cli_handler.check_configuration()
-            exit_code = 0 if success else 1
+            return 0 if success else 1
+        
+        if not await app.initialize_full():
+            print("❌ Failed to initialize AI Assistant")
+            return 1
+        
+        if args.get('daemon'):
+            # Serve later invocations until a shutdown signal arrives
+            await app.run_daemon()
         else:
-            # Batch mode
-            exit_code = await app.run_batch_mode(args)
+            exit_code = await app.run_mode(args)
             
     except AIAssistantError as e:
         print(f"❌ AI Assistant Error: {e}")
@@ -269,8 +649,7 @@ async def main():
     except Exception as e:
         print(f"❌ Unexpected Error: {e}")
         if app and app.logger:
-            app.logger.error(f"Unexpected error: {e}")
-            app.logger.error(traceback.format_exc())
+            app.logger.exception(f"Unexpected error: {e}")
         exit_code = 1
         
     finally:
@@ -280,31 +659,211 @@ async def main():
     
     return exit_code
 
+def _read_line(prompt: str) -> asyncio.Future:
+    """Read a line from stdin in a daemon thread and return a future for it
+    
+    Unlike asyncio.to_thread(input) nothing joins the thread, so shutting
+    down while input() blocks does not wait for the user to press Enter.
+    """
+    import threading
+    
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def deliver(line, error):
+        if future.done():
+            return
+        if error is None:
+            future.set_result(line)
+        else:
+            future.set_exception(error)
+    
+    def read():
+        try:
+            line, error = input(prompt), None
+        except BaseException as e:
+            # EOFError, or an error reading stdin
+            line, error = None, e
+        try:
+            loop.call_soon_threadsafe(deliver, line, error)
+        except RuntimeError:
+            # The loop has closed: nothing is waiting for the line
+            pass
+    
+    threading.Thread(target=read, name="input-reader", daemon=True).start()
+    return future
+
+def _cancel_all_tasks(loop: asyncio.AbstractEventLoop):
+    """Cancel the tasks main() left running and wait for them, as asyncio.run() does"""
+    tasks = asyncio.all_tasks(loop)
+    if not tasks:
+        return
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            loop.call_exception_handler({
+                'message': 'unhandled exception during shutdown',
+                'exception': task.exception(),
+                'task': task,
+            })
+
+_DATA_SUBDIRS = ("logs", "cache", "embeddings")
+
+# Flags answered by the argument parser alone
+_INFO_FLAGS = frozenset(('-h', '--help', '--version'))
+
+# Longest request line the daemon accepts; asyncio's default is 64 KiB
+_DAEMON_REQUEST_LIMIT = 16 * 1024 * 1024
+
+# Command lines with these flags always run in this process; the daemon also
+# declines abbreviated forms once it has parsed them
+_NO_FORWARD_FLAGS = frozenset({'--daemon', '-i', '--interactive', '--stdin'})
+
+def _json_codec():
+    """(dumps, loads) for the daemon protocol; dumps returns UTF-8 bytes
+    
+    orjson is used when it is installed, the standard json module otherwise.
+    """
+    try:
+        import orjson
+        return orjson.dumps, orjson.loads
+    except ImportError:
+        import json
+        return (lambda obj: json.dumps(obj).encode('utf-8')), json.loads
+
+def _daemon_listening() -> bool:
+    """Whether a daemon answers on DAEMON_SOCKET"""
+    import socket
+    
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(DAEMON_SOCKET))
+        except OSError:
+            return False
+    return True
+
+def _forward_to_daemon(argv) -> Optional[int]:
+    """Run argv in a running daemon and return its exit code
+    
+    Returns None when there is no daemon or it asks for a local run, in which
+    case the normal startup path handles the command.
+    """
+    if not argv or sys.platform == "win32" or _NO_FORWARD_FLAGS.intersection(argv):
+        return None
+    if not DAEMON_SOCKET.exists():
+        return None
+    
+    import socket
+    
+    json_dumps, json_loads = _json_codec()
+    request = json_dumps({'argv': list(argv), 'cwd': os.getcwd()}) + b'\n'
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(DAEMON_SOCKET))
+        except OSError:
+            # Stale socket file: no daemon is listening
+            return None
+        
+        try:
+            sock.sendall(request)
+        except OSError:
+            # The daemon stopped reading (e.g. an oversized request): nothing ran
+            return None
+        
+        try:
+            with sock.makefile('rb') as reply_file:
+                reply = json_loads(reply_file.readline())
+        except (OSError, ValueError) as e:
+            print(f"❌ Daemon error: {e}")
+            return 1
+    
+    if reply.get('exit_code') is None:
+        return None
+    sys.stdout.write(reply.get('output', ''))
+    sys.stderr.write(reply.get('errors', ''))
+    return reply['exit_code']
+
+def _ensure_data_dirs():
+    """Create the data directories that are missing
+    
+    One scandir of data/ replaces a mkdir call per directory on every start.
+    """
+    data_dir = PROJECT_ROOT / "data"
+    try:
+        with os.scandir(data_dir) as entries:
+            existing = {entry.name for entry in entries if entry.is_dir()}
+    except FileNotFoundError:
+        existing = set()
+    
+    for name in _DATA_SUBDIRS:
+        if name not in existing:
+            (data_dir / name).mkdir(parents=True, exist_ok=True)
+    
+    sandbox_dir = PROJECT_ROOT / "sandbox_workspaces"
+    if not sandbox_dir.is_dir():
+        sandbox_dir.mkdir(parents=True, exist_ok=True)
+
 def run():
     """Synchronous entry point for setup.py"""
+    # Add project root to Python path (only when running, not on import)
+    project_root = str(PROJECT_ROOT)
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    
     try:
         # Check Python version
-        if sys.version_info < (3, 8):
-            print("❌ Python 3.8 or higher is required")
+        if sys.version_info < (3, 10):
+            print("❌ Python 3.10 or higher is required")
             sys.exit(1)
+        
+        # --help and --version need only the argument parser: answer them
+        # before any configuration, database or daemon work
+        argv = sys.argv[1:]
+        if len(argv) == 1 and argv[0] in _INFO_FLAGS:
+            CLIHandler, = _import_all('core.cli:CLIHandler')
+            CLIHandler().parse_arguments(argv)  # prints and exits
+        
+        # Hand the command to a running daemon if there is one
+        exit_code = _forward_to_daemon(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
             
         # Create data directories if they don't exist
-        data_dirs = [
-            PROJECT_ROOT / "data" / "logs",
-            PROJECT_ROOT / "data" / "cache",
-            PROJECT_ROOT / "data" / "embeddings",
-            PROJECT_ROOT / "sandbox_workspaces"
-        ]
-        
-        for dir_path in data_dirs:
-            dir_path.mkdir(parents=True, exist_ok=True)
+        _ensure_data_dirs()
         
         # Run main async function
         if sys.platform == "win32":
             # Windows specific event loop policy
             asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        else:
+            # uvloop is optional; the default selector loop is used without it
+            try:
+                import uvloop
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            except ImportError:
+                pass
         
-        exit_code = asyncio.run(main())
+        # Drive main() on a loop owned here instead of asyncio.run(). Worker
+        # Leftover tasks are cancelled and threads started by asyncio.to_thread()
+        # are joined before closing.
+        loop = asyncio.new_event_loop()
+        if '--debug' not in sys.argv[1:]:
+            # Debug mode slows every callback; an inherited
+            # PYTHONASYNCIODEBUG=1 only applies to --debug runs
+            loop.set_debug(False)
+        try:
+            asyncio.set_event_loop(loop)
+            exit_code = loop.run_until_complete(main())
+        finally:
+            try:
+                _cancel_all_tasks(loop)
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.run_until_complete(loop.shutdown_default_executor())
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
         sys.exit(exit_code)
         
     except KeyboardInterrupt: